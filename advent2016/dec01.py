@@ -38,22 +38,20 @@ blocks away, due East.
 
 How many blocks away is the first location you visit twice?
 """
-import numpy as np
-
 import utils
+from common import grid
 
-LEFT_TURN = np.matrix([[0, -1], [1, 0]])
-RIGHT_TURN = np.matrix([[0, 1], [-1, 0]])
-
-ROTATE = {'L': LEFT_TURN, 'R': RIGHT_TURN}
+# (dx, dy) after turning from a direction
+TURNS = {
+    'L': lambda dx, dy: (-dy, dx),
+    'R': lambda dx, dy: (dy, -dx),
+}
 
 
 def get_new_location(seq):
-    # start facing north
-    direction = np.matrix([0, 1]).T
-
-    # start at 0, 0
-    location = np.matrix([0, 0]).T
+    # start at 0, 0 facing north
+    x, y = 0, 0
+    dx, dy = 0, 1
 
     moves = seq.split(', ')
 
@@ -61,22 +59,22 @@ def get_new_location(seq):
         move_direction, move_distance = move[0], int(move[1:])
 
         # rotate to new direction
-        direction = ROTATE[move_direction] * direction
+        dx, dy = TURNS[move_direction](dx, dy)
 
         # jump to new location
-        location += direction * move_distance
+        x += dx * move_distance
+        y += dy * move_distance
 
-    return np.sum(np.abs(location))
+    return abs(x) + abs(y)
 
 
 def get_first_location_twice(seq):
-    # start facing north
-    direction = np.matrix([0, 1]).T
-
-    # start at 0, 0
-    location = np.matrix([0, 0]).T
+    # start at 0, 0 facing north
+    x, y = 0, 0
+    dx, dy = 0, 1
 
-    visited_locations = set(tuple(location.flat))
+    visited_locations = grid.Grid(typecode='b')
+    visited_locations[x, y] = 1
 
     moves = seq.split(', ')
 
@@ -84,17 +82,17 @@ def get_first_location_twice(seq):
         move_direction, move_distance = move[0], int(move[1:])
 
         # rotate to new direction
-        direction = ROTATE[move_direction] * direction
+        dx, dy = TURNS[move_direction](dx, dy)
 
         # check whether each step has already been visited
         for _ in range(move_distance):
-            location += direction
-            flattened_location = tuple(location.flat)
+            x += dx
+            y += dy
 
-            if flattened_location in visited_locations:
-                return np.sum(np.abs(location))
+            if visited_locations.get(x, y, 0):
+                return abs(x) + abs(y)
 
-            visited_locations.add(flattened_location)
+            visited_locations[x, y] = 1
 
 
 def run_tests():
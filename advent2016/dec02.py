@@ -72,55 +72,66 @@ Using the same instructions in your puzzle input, what is the correct bathroom c
 
 """
 
-import numpy as np
+import functools
 
 import utils
+from common import grid
 
-KEYPAD_1 = np.array([
-    ['1', '2', '3'],
-    ['4', '5', '6'],
-    ['7', '8', '9']])
+KEYPAD_1 = (
+    ('1', '2', '3'),
+    ('4', '5', '6'),
+    ('7', '8', '9'))
 
-KEYPAD_2 = np.array([
-    [None, None, '1', None, None],
-    [None, '2', '3', '4', None],
-    ['5', '6', '7', '8', '9'],
-    [None, 'A', 'B', 'C', None],
-    [None, None, 'D', None, None]])
+KEYPAD_2 = (
+    (None, None, '1', None, None),
+    (None, '2', '3', '4', None),
+    ('5', '6', '7', '8', '9'),
+    (None, 'A', 'B', 'C', None),
+    (None, None, 'D', None, None))
 
-# direction: (row, column)
+# grid value of a hole in the keypad, or a position off the edge
+NO_BUTTON = 0
+
+# direction: (x, y), with y increasing down the keypad
 MOVES = {
-    'U': np.array([1, 0]),
-    'D': np.array([1, 0]),
-    'R': np.array([0, 1]),
-    'L': np.array([0, -1])
+    'U': (0, -1),
+    'D': (0, 1),
+    'R': (1, 0),
+    'L': (-1, 0)
 }
 
 
+@functools.lru_cache(maxsize=None)
+def get_keypad_grid(keypad):
+    # buttons are stored as their character codes
+    return grid.Grid.from_rows([[ord(button) if button else NO_BUTTON for button in row]
+                                for row in keypad], typecode='B')
+
+
 def get_position(value, keypad):
-    x_vals, y_vals = np.where(keypad == value)
-    return np.array([x_vals[0], y_vals[0]])
+    return keypad.find(ord(value))
 
 
 def get_value(position, keypad):
-    column, row = position[0], position[1]
-    return keypad[column, row]
+    button = keypad.get(*position, NO_BUTTON)
+    return chr(button) if button != NO_BUTTON else None
 
 
 def get_next_code_value(start_value, instructions, keypad):
-    position = get_position(start_value, keypad)
+    x, y = get_position(start_value, keypad)
 
     for letter in instructions:
-        move_direction = MOVES[letter]
-        new_position = position + move_direction
+        dx, dy = MOVES[letter]
 
-        if get_value(new_position, keypad):
-            position = new_position
+        # positions off the edge of the keypad are holes
+        if keypad.get(x + dx, y + dy, NO_BUTTON) != NO_BUTTON:
+            x, y = x + dx, y + dy
 
-    return get_value(position, keypad)
+    return get_value((x, y), keypad)
 
 
 def get_code(start_value, instructions, keypad):
+    keypad = get_keypad_grid(keypad)
     code = []
     for line in instructions:
         code.append(get_next_code_value(start_value, line, keypad))
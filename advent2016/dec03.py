@@ -16,49 +16,86 @@ the "triangle" given above is impossible, because 5 + 10 is not larger than 25.
 In your puzzle input, how many of the listed triangles are possible?
 """
 
+import itertools
+
 import utils
 
+np = utils.lazy_import('numpy')
+
+# rows parsed at a time when streaming. A multiple of 3, so vertical triangles never span blocks
+BLOCK_ROWS = 3 * 2 ** 14
+
+
+def parse_sides(side_list):
+    """Parse lines of three side lengths into an (N, 3) array, in one go"""
+    if isinstance(side_list, np.ndarray):
+        return side_list.reshape(-1, 3)
+
+    side_list = list(side_list)
+    text = '\n'.join(side_list)
+
+    # the lines are parsed together, so check each has 3 fields first, or a short line would
+    # borrow a side from the next: the third field of each line must start before its line ends,
+    # and the next line's first field after it
+    chars = np.frombuffer(text.encode(), dtype=np.uint8)
+    is_space = chars <= ord(' ')
+    field_starts = np.flatnonzero(~is_space[1:] & is_space[:-1]) + 1
+    if len(chars) and not is_space[0]:
+        field_starts = np.concatenate(([0], field_starts))
+    line_ends = np.flatnonzero(chars == ord('\n'))
+    if (len(field_starts) != 3 * len(side_list) or len(line_ends) != max(len(side_list) - 1, 0)
+            or (field_starts[2::3][:-1] > line_ends).any() or (line_ends > field_starts[3::3]).any()):
+        bad_lines = [line for line in side_list if len(line.split()) != 3]
+        raise ValueError('EVERY LINE MUST HAVE 3 SIDES: %r' % bad_lines[:1])
+
+    sides = np.fromstring(text, dtype=np.int64, sep=' ')
+    if len(sides) != 3 * len(side_list):
+        raise ValueError('SIDES MUST BE INTEGERS: %d OF %d PARSED' % (len(sides), 3 * len(side_list)))
+    return sides.reshape(-1, 3)
 
-def is_triangle(sides):
-    if len(sides) < 3:
-        return False
 
-    sides = sorted(sides)
-    return sides[2] < sides[0] + sides[1]
+def count_valid_triangles(sides):
+    """Count the rows of an (N, 3) array of side lengths that make a triangle"""
+    sides = np.sort(sides, axis=1)
+    return int(np.count_nonzero(sides[:, 2] < sides[:, 0] + sides[:, 1]))
+
+
+def get_vertical_sides(sides):
+    # each block of three rows has a triangle in each column. Incomplete blocks are ignored
+    sides = sides[:len(sides) - len(sides) % 3]
+    return sides.reshape(-1, 3, 3).transpose(0, 2, 1).reshape(-1, 3)
 
 
 def count_triangles(side_list):
-    num_triangles = 0
-    for sides_text in side_list:
-        sides = [int(s) for s in sides_text.split()]
+    return count_valid_triangles(parse_sides(side_list))
+
 
-        if is_triangle(sides):
-            num_triangles += 1
+def count_vertical_triangles(side_list):
+    return count_valid_triangles(get_vertical_sides(parse_sides(side_list)))
 
-    return num_triangles
 
+def iter_side_blocks(lines, block_rows=BLOCK_ROWS):
+    """Parse any iterable of lines into (block_rows, 3) arrays. Only the last block is shorter"""
+    line_iter = iter(lines)
+    while True:
+        block = list(itertools.islice(line_iter, block_rows))
+        if not block:
+            return
+        yield parse_sides(block)
 
-def get_next_three_horizontal_sides(lines):
-    num_lines = 3
-    for i in range(0, len(lines), num_lines):
-        result = []
-        for j in range(3):
-            result.append([int(s) for s in lines[i + j].split()])
-        yield result
 
+def stream_count_triangles(lines, block_rows=BLOCK_ROWS):
+    """count_triangles in a single pass over lines, holding one block of rows at a time"""
+    return sum(count_valid_triangles(sides) for sides in iter_side_blocks(lines, block_rows))
 
-def count_vertical_triangles(text):
-    num_triangles = 0
 
-    horizontal_side_gen = get_next_three_horizontal_sides(text)
-    for horizontal_side_list in horizontal_side_gen:
-        for i in range(3):
-            # use the ith column value for each side
-            vertical_sides = [s[i] for s in horizontal_side_list]
-            if is_triangle(vertical_sides):
-                num_triangles += 1
+def stream_count_vertical_triangles(lines, block_rows=BLOCK_ROWS):
+    """count_vertical_triangles in a single pass over lines, holding one block of rows at a time"""
+    if block_rows % 3:
+        raise ValueError('BLOCK ROWS MUST BE A MULTIPLE OF 3: %d' % block_rows)
 
-    return num_triangles
+    return sum(count_valid_triangles(get_vertical_sides(sides))
+               for sides in iter_side_blocks(lines, block_rows))
 
 
 def run_tests():
@@ -78,12 +115,25 @@ def run_tests():
         act_res = count_vertical_triangles(seq)
         assert act_res == res, 'COUNT VERTICAL TRIANGLES: %r != %r (EXPECTED)' % (act_res, res)
 
+        # sides can also be parsed in advance
+        act_res = count_vertical_triangles(parse_sides(seq))
+        assert act_res == res, 'COUNT VERTICAL TRIANGLES (ARRAY): %r != %r (EXPECTED)' % \
+                               (act_res, res)
+
+    seq = ['1 5 7', '10 5 2', '6 6 11', '3 4 5', '5 5 5', '1 1 3', '2 2 2']
+    for block_rows in [3, 6, BLOCK_ROWS]:
+        act_res = stream_count_triangles(iter(seq), block_rows), \
+            stream_count_vertical_triangles(iter(seq), block_rows)
+        res = count_triangles(seq), count_vertical_triangles(seq)
+        assert act_res == res, 'STREAMED COUNTS: %r != %r (EXPECTED)' % (act_res, res)
+
 
 if __name__ == '__main__':
     run_tests()
 
     filename = 'dec03_input.txt'
-    inputs = utils.read_file(filename)
 
-    print('TRIANGLE COUNT: %r' % count_triangles(inputs))
-    print('VERTICAL TRIANGLE COUNT: %d' % count_vertical_triangles(inputs))
+    sides = utils.read_array(filename, dtype=np.int64, columns=3)
+
+    print('TRIANGLE COUNT: %r' % count_triangles(sides))
+    print('VERTICAL TRIANGLE COUNT: %d' % count_vertical_triangles(sides))
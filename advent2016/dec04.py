@@ -23,17 +23,91 @@ Of the real rooms from the list above, the sum of their sector IDs is 1514.
 What is the sum of the sector IDs of the real rooms?
 """
 from collections import defaultdict
+import itertools
+import os
 import re
+import string
+import sys
 
 import utils
 
+np = utils.lazy_import('numpy')
+multiprocessing = utils.lazy_import('multiprocessing')
+
+# rooms validated at a time, so streamed input is processed in constant memory
+BLOCK_ROOMS = 2 ** 14
+
+# shards per worker process, so a slow shard doesn't leave the other workers idle
+SHARDS_PER_PROCESS = 4
+
+ROOM_PATTERN = re.compile(r'(?P<encrypted_name>[a-z\-]+)(?P<sector_id>\d+)\[(?P<checksum>[a-z]+)\]')
+# a whole line of a room list, for matching every line in one findall
+ROOM_LINE_PATTERN = re.compile(r'^%s$' % ROOM_PATTERN.pattern, re.MULTILINE)
+
+# words in the decrypted name of the room where North Pole objects are stored
+NORTH_POLE_KEYWORDS = ('northpole',)
+
+# str.translate table for each shift of the cypher. Dashes become spaces
+SHIFT_TABLES = [str.maketrans(string.ascii_lowercase + '-',
+                              string.ascii_lowercase[shift:] + string.ascii_lowercase[:shift] + ' ')
+                for shift in range(26)]
+
 
 def extract_input_params(seq):
-    pattern = r'(?P<encrypted_name>[a-z\-]+)(?P<sector_id>\d+)\[(?P<checksum>[a-z]+)\]'
-    match = re.search(pattern, seq)
+    match = ROOM_PATTERN.search(seq)
     return match.group('encrypted_name'), int(match.group('sector_id')), match.group('checksum')
 
 
+def parse_rooms(seq_list):
+    # (encrypted_name, sector_id, checksum) tuples, e.g. for utils.read_parsed. Every line is
+    # parsed by a single scan of the compiled pattern. Blank lines are skipped
+    seq_list = [seq for seq in seq_list if seq.strip()]
+    rooms = ROOM_LINE_PATTERN.findall('\n'.join(seq_list))
+    if len(rooms) != len(seq_list):
+        bad_seq = next(seq for seq in seq_list if not ROOM_LINE_PATTERN.fullmatch(seq))
+        raise ValueError('NOT A ROOM: %r' % bad_seq)
+    return [(encrypted_name, int(sector_id), checksum)
+            for encrypted_name, sector_id, checksum in rooms]
+
+
+def iter_room_blocks(seq_list, block_rooms=BLOCK_ROOMS):
+    """Parse any iterable of room lines, or of rooms already parsed by parse_rooms, into lists of
+    block_rooms parsed rooms. Only the last block is shorter"""
+    seq_iter = iter(seq_list)
+    while True:
+        block = list(itertools.islice(seq_iter, block_rooms))
+        if not block:
+            return
+        yield parse_rooms(block) if isinstance(block[0], str) else block
+
+
+def find_real_rooms(rooms):
+    """Boolean array of which parsed rooms are real. The letter histograms of every room are
+    counted at once with a 2D bincount, and the checksums are compared in a single array op"""
+    num_rooms = len(rooms)
+    names = [encrypted_name for encrypted_name, _, _ in rooms]
+
+    codes = np.frombuffer(''.join(names).encode(), dtype=np.uint8)
+    room_index = np.repeat(np.arange(num_rooms), [len(name) for name in names])
+    is_letter = codes != ord('-')
+    hist = np.bincount(room_index[is_letter] * 26 + (codes[is_letter] - ord('a')),
+                       minlength=num_rooms * 26).reshape(num_rooms, 26)
+
+    # most frequent letter first, then alphabetical. Each key is unique within a room
+    keys = hist * 26 + np.arange(25, -1, -1)
+    top_letters = np.argsort(-keys, axis=1)[:, :5]
+    # rooms with fewer than 5 different letters have shorter checksums, padded with 0
+    top_counts = hist[np.arange(num_rooms)[:, None], top_letters]
+    expected = np.where(top_counts > 0, top_letters + ord('a'), 0)
+
+    checksums = [checksum for _, _, checksum in rooms]
+    padded = ''.join(checksum[:5].ljust(5, '\0') for checksum in checksums).encode()
+    actual = np.frombuffer(padded, dtype=np.uint8).reshape(num_rooms, 5)
+    too_long = np.array([len(checksum) > 5 for checksum in checksums], dtype=bool)
+
+    return (expected == actual).all(axis=1) & ~too_long
+
+
 def get_checksum(encrypted_name):
     # setup a histogram of letter counts
     hist = defaultdict(int)
@@ -51,18 +125,7 @@ def get_checksum(encrypted_name):
 
 
 def shift_cypher(encrypted_name, shift):
-    alphabet = 'abcdefghijklmnopqrstuvwxyz'
-    result = []
-    for letter in encrypted_name:
-        if letter == '-':
-            result.append(' ')
-            continue
-        i = alphabet.index(letter)
-        new_i = (i + shift) % len(alphabet)
-
-        result.append(alphabet[new_i])
-
-    return (''.join(result)).strip()
+    return encrypted_name.translate(SHIFT_TABLES[shift % 26]).strip()
 
 
 def get_decrypted_name(seq):
@@ -82,24 +145,113 @@ def get_real_sector_id(seq):
     return sector_id
 
 
-def sum_real_sector_ids(seq_list):
-    return sum([get_real_sector_id(seq) for seq in seq_list])
+def sum_real_sector_ids(seq_list, block_rooms=BLOCK_ROOMS):
+    # validated a block at a time, so a stream of lines is summed in constant memory
+    total = 0
+    for rooms in iter_room_blocks(seq_list, block_rooms):
+        sector_ids = np.fromiter((sector_id for _, sector_id, _ in rooms), dtype=np.int64,
+                                 count=len(rooms))
+        total += int(sector_ids[find_real_rooms(rooms)].sum())
+    return total
+
+
+class NameIndex:
+    """Inverted index from each word of the real rooms' decrypted names to the rooms containing
+    it. Every room is decrypted once, when the index is built, so any number of keyword
+    searches can be answered from the index"""
+
+    def __init__(self, seq_list):
+        # (decrypted_name, sector_id) of each real room, in room order
+        self.rooms = []
+        self.words = defaultdict(set)
+
+        for rooms in iter_room_blocks(seq_list):
+            for (encrypted_name, sector_id, _), is_real in zip(rooms, find_real_rooms(rooms)):
+                if is_real:
+                    decrypted_name = shift_cypher(encrypted_name, sector_id)
+                    for word in decrypted_name.split():
+                        self.words[word].add(len(self.rooms))
+                    self.rooms.append((decrypted_name, sector_id))
+
+    def search(self, *keywords):
+        """(decrypted_name, sector_id) of the real rooms whose names contain every keyword as a
+        whole word, in room order. Each keyword is a single lookup in the index"""
+        if not keywords:
+            return []
+        matches = set.intersection(*(self.words.get(keyword, set()) for keyword in keywords))
+        return [self.rooms[i] for i in sorted(matches)]
+
+
+def get_north_pole_sector_id(seq_list, verbose=False, name_index=None):
+    result = None
+    name_index = name_index or NameIndex(seq_list)
+    for decrypted_name, sector_id in name_index.search(*NORTH_POLE_KEYWORDS):
+        result = sector_id
+        if verbose:
+            print('\tFOUND A CANDIDATE ROOM: %s' % decrypted_name)
+
+    return result
 
 
-def get_north_pole_sector_id(seq_list, verbose=False):
-    result = None
-    for seq in seq_list:
-        encrypted_name, sector_id, checksum = extract_input_params(seq)
-        if get_checksum(encrypted_name) != checksum:
+def get_shards(filename, num_shards):
+    """Split a file into about num_shards (start, stop) byte ranges, each starting on a line"""
+    size = os.path.getsize(filename)
+    boundaries = [0]
+    with open(filename, 'rb') as fin:
+        for i in range(1, num_shards):
+            position = max(size * i // num_shards, boundaries[-1] + 1)
+            if position >= size:
+                break
+            # skip to the start of the next line, unless position is already at one
+            fin.seek(position - 1)
+            fin.readline()
+            boundaries.append(fin.tell())
+
+    boundaries.append(size)
+    return [(start, stop) for start, stop in zip(boundaries, boundaries[1:]) if start < stop]
+
+
+def validate_shard(filename, start, stop, keywords):
+    """Sum of the real sector IDs in one shard of a room file, and the (decrypted_name, sector_id)
+    of its real rooms that contain every keyword, as NameIndex.search would find them"""
+    with open(filename, 'rb') as fin:
+        fin.seek(start)
+        rooms = parse_rooms(fin.read(stop - start).decode().splitlines())
+
+    total = 0
+    matches = []
+    for (encrypted_name, sector_id, _), is_real in zip(rooms, find_real_rooms(rooms)):
+        if not is_real:
             continue
+        total += sector_id
 
         decrypted_name = shift_cypher(encrypted_name, sector_id)
-        if 'north' in decrypted_name and 'pole' in decrypted_name:
-            result = sector_id
-            if verbose:
-                print('\tFOUND A CANDIDATE ROOM: %s' % decrypted_name)
+        if set(keywords) <= set(decrypted_name.split()):
+            matches.append((decrypted_name, sector_id))
 
-    return result
+    return total, matches
+
+
+def validate_file(filename, keywords=NORTH_POLE_KEYWORDS, processes=None):
+    """Validate and decrypt a room file in line-aligned shards on a process pool. The partial
+    sums and matches are reduced in file order, so the results are the same as the serial
+    sum_real_sector_ids and NameIndex.search"""
+    processes = processes or os.cpu_count()
+    tasks = [(filename, start, stop, keywords)
+             for start, stop in get_shards(filename, processes * SHARDS_PER_PROCESS)]
+
+    # pool workers are daemonic, and can't start their own pool
+    daemon = multiprocessing.current_process().daemon
+    if processes > 1 and daemon:
+        print('dec04: running in a daemonic process, so validating serially', file=sys.stderr)
+    if processes <= 1 or daemon:
+        results = [validate_shard(*task) for task in tasks]
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.starmap(validate_shard, tasks)
+
+    total = sum(shard_total for shard_total, _ in results)
+    return total, [match for _, shard_matches in results for match in shard_matches]
 
 
 def run_tests():
@@ -119,13 +271,23 @@ def run_tests():
     act_res = get_decrypted_name(seq)
     assert act_res == res, 'DECRYPTED NAME: %r != %r (EXPECTED)' % (act_res, res)
 
+    # the same name twice. zimth is its real checksum, so only the first is found; seq, with
+    # checksum zimtk, is a decoy
+    seq_list = ['qzmt-zixmtkozy-ivhz-343[zimth]', seq, 'aaaaa-bbb-z-y-x-123[abxyz]']
+    res = [('very encrypted name', 343)]
+    act_res = NameIndex(seq_list).search('encrypted', 'very')
+    assert act_res == res, 'NAME SEARCH: %r != %r (EXPECTED)' % (act_res, res)
+
+    act_res = NameIndex(seq_list).search('crypt')
+    assert act_res == [], 'PART WORD SEARCH: %r != [] (EXPECTED)' % (act_res,)
+
 
 if __name__ == '__main__':
     run_tests()
 
     filename = 'dec04_input.txt'
-    inputs = utils.read_file(filename)
+    rooms = utils.read_parsed(filename, parse_rooms)
 
-    print('SUM OF REAL SECTOR IDS: %r' % sum_real_sector_ids(inputs))
+    print('SUM OF REAL SECTOR IDS: %r' % sum_real_sector_ids(rooms))
     print('NORTH POLE OBJECTS ARE STORED IN SECTOR ID: %r' \
-          % get_north_pole_sector_id(inputs, verbose=True))
+          % get_north_pole_sector_id(rooms, verbose=True))
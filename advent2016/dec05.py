@@ -54,58 +54,235 @@ if it uses a cinematic "decrypting" animation.
 
 Your puzzle input is still uqwqemis.
 """
+import collections
 import hashlib
+import itertools
+import os
+import sys
 
 import utils
-
-
-def zero_hash_generator(door_id):
-    index_limit = 10 ** 8
-    for i in range(index_limit):
-        h = hashlib.md5()
-        h.update((door_id + str(i)).encode())
-        h_hex = h.hexdigest()
-
-        if len(h_hex) >= 6 and h_hex[:5] == '00000':
+from common import instrument
+
+# only needed once mining starts
+multiprocessing = utils.lazy_import('multiprocessing')
+sqlite3 = utils.lazy_import('sqlite3')
+
+INDEX_LIMIT = 10 ** 8
+
+# indices hashed per task. Large enough that pool overhead is negligible, small enough that
+# little work is wasted after the last hit
+CHUNK_SIZE = 10 ** 5
+
+# chunks queued per worker, so workers never wait for the next chunk
+CHUNKS_PER_PROCESS = 2
+
+# number of leading zero hex digits in the hashes that make up a password
+ZERO_NIBBLES = 5
+
+HIT_INDEX_PATH = os.path.join(utils.CACHE_DIR, 'dec05_hits.sqlite')
+
+# the passwords get_passwords can fill in: the first from the sixth character of each zero hash in
+# turn, and the ordered one from the seventh character, at the position given by the sixth
+PASSWORD_KINDS = ('first', 'ordered')
+
+
+def zero_bound(zero_nibbles):
+    """A digest starts with zero_nibbles zero hex digits if it's less than this"""
+    if not 1 <= zero_nibbles <= 32:
+        raise ValueError('ZERO NIBBLES MUST BE FROM 1 TO 32: %r' % zero_nibbles)
+    return (1 << (128 - 4 * zero_nibbles)).to_bytes(16, 'big')
+
+
+def count_zero_nibbles(digest):
+    h_hex = digest.hex()
+    return len(h_hex) - len(h_hex.lstrip('0'))
+
+
+def mine_chunk(door_id, start, stop, zero_nibbles=ZERO_NIBBLES):
+    """Hash indices start to stop - 1, and return the (index, digest) of each zero hash"""
+    bound = zero_bound(zero_nibbles)
+    # the door ID is hashed once, and its state copied for each index
+    copy_prefix = hashlib.md5(door_id.encode()).copy
+    hits = []
+    for i in range(start, stop):
+        h = copy_prefix()
+        h.update(b'%d' % i)
+        # compare raw digests, and only keep the hits
+        digest = h.digest()
+        if digest < bound:
+            hits.append((i, digest))
+    return hits
+
+
+def iter_chunks(door_id, processes, start=0, stop=INDEX_LIMIT, zero_nibbles=ZERO_NIBBLES):
+    chunks = ((door_id, chunk_start, min(chunk_start + CHUNK_SIZE, stop), zero_nibbles)
+              for chunk_start in range(start, stop, CHUNK_SIZE))
+
+    # pool workers are daemonic, and can't start their own pool
+    daemon = multiprocessing.current_process().daemon
+    if processes > 1 and daemon:
+        print('dec05: running in a daemonic process, so mining serially', file=sys.stderr)
+    if processes <= 1 or daemon:
+        for chunk in chunks:
+            yield chunk[2], mine_chunk(*chunk)
+        return
+
+    with multiprocessing.Pool(processes) as pool:
+        # a bounded queue of chunks in index order, so hits are merged in index order and
+        # the pool stops soon after the caller stops asking for hashes
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append((chunk[2], pool.apply_async(mine_chunk, chunk)))
+            if len(pending) >= processes * CHUNKS_PER_PROCESS:
+                chunk_stop, hits = pending.popleft()
+                yield chunk_stop, hits.get()
+
+        while pending:
+            chunk_stop, hits = pending.popleft()
+            yield chunk_stop, hits.get()
+
+
+class HitIndex:
+    """On-disk index of the zero hashes found for each door ID, and the index ranges that have
+    been mined. Queries over ranges that have already been mined are lookups"""
+
+    def __init__(self, path=HIT_INDEX_PATH):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS hits (
+                door_id TEXT, idx INTEGER, digest BLOB, zero_nibbles INTEGER,
+                PRIMARY KEY (door_id, idx));
+            -- every hit in [start, stop) with at least zero_nibbles leading zeros is in hits
+            CREATE TABLE IF NOT EXISTS mined (
+                door_id TEXT, zero_nibbles INTEGER, start INTEGER, stop INTEGER);
+            CREATE INDEX IF NOT EXISTS mined_start ON mined (door_id, start);
+        """)
+
+    def close(self):
+        self.connection.close()
+
+    def mined_to(self, door_id, zero_nibbles, index):
+        """End of the mined range containing index, or index if it hasn't been mined"""
+        row = self.connection.execute(
+            'SELECT MAX(stop) FROM mined WHERE door_id = ? AND zero_nibbles <= ? '
+            'AND start <= ? AND stop > ?', (door_id, zero_nibbles, index, index)).fetchone()
+        return row[0] if row[0] is not None else index
+
+    def next_mined(self, door_id, zero_nibbles, index):
+        """Start of the first mined range after index"""
+        row = self.connection.execute(
+            'SELECT MIN(start) FROM mined WHERE door_id = ? AND zero_nibbles <= ? AND start > ?',
+            (door_id, zero_nibbles, index)).fetchone()
+        return row[0] if row[0] is not None else INDEX_LIMIT
+
+    def stored_hits(self, door_id, zero_nibbles, start, stop):
+        return self.connection.execute(
+            'SELECT idx, digest FROM hits WHERE door_id = ? AND zero_nibbles >= ? '
+            'AND idx >= ? AND idx < ? ORDER BY idx',
+            (door_id, zero_nibbles, start, stop)).fetchall()
+
+    def add(self, door_id, zero_nibbles, start, stop, hits):
+        """Record the hits mined from start to stop - 1"""
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR IGNORE INTO hits VALUES (?, ?, ?, ?)',
+                [(door_id, i, digest, count_zero_nibbles(digest)) for i, digest in hits])
+
+            # extend the range that ends at start, rather than adding one range per chunk
+            extended = self.connection.execute(
+                'UPDATE mined SET stop = ? WHERE door_id = ? AND zero_nibbles = ? AND stop = ?',
+                (stop, door_id, zero_nibbles, start)).rowcount
+            if not extended:
+                self.connection.execute('INSERT INTO mined VALUES (?, ?, ?, ?)',
+                                        (door_id, zero_nibbles, start, stop))
+
+    def iter_hits(self, door_id, zero_nibbles=ZERO_NIBBLES, start=0, processes=None):
+        """Every (index, hash) from start onwards whose hash starts with zero_nibbles zeros, in
+        index order. Gaps in the mined ranges are mined in chunks on each core"""
+        processes = processes or os.cpu_count()
+        index = start
+        while index < INDEX_LIMIT:
+            stop = self.mined_to(door_id, zero_nibbles, index)
+            if stop > index:
+                for i, digest in self.stored_hits(door_id, zero_nibbles, index, stop):
+                    instrument.count('dec05.stored_hits')
+                    yield i, digest.hex()
+                index = stop
+                continue
+
+            gap_stop = self.next_mined(door_id, zero_nibbles, index)
+            for stop, hits in iter_chunks(door_id, processes, index, gap_stop, zero_nibbles):
+                # count hashes per chunk, rather than per hash, to keep the loop fast
+                instrument.count('dec05.md5_hashes', stop - index)
+                self.add(door_id, zero_nibbles, index, stop, hits)
+                index = stop
+
+                for i, digest in hits:
+                    instrument.count('dec05.zero_hashes')
+                    yield i, digest.hex()
+
+        raise Exception('INDEX HIGHER THAN %d' % INDEX_LIMIT)
+
+    def next_hits(self, door_id, count, zero_nibbles=ZERO_NIBBLES, start=0, processes=None):
+        """The next count (index, hash) hits with zero_nibbles leading zeros from start"""
+        return list(itertools.islice(self.iter_hits(door_id, zero_nibbles, start, processes), count))
+
+
+def open_hit_index():
+    # an in-memory index when the cache is bypassed, so every hash is mined
+    return HitIndex(':memory:' if os.environ.get(utils.NO_CACHE_ENV) else HIT_INDEX_PATH)
+
+
+def zero_hash_generator(door_id, zero_nibbles=ZERO_NIBBLES, processes=None):
+    """Every hash starting with zero_nibbles zeros, in index order"""
+    hit_index = open_hit_index()
+    try:
+        for _, h_hex in hit_index.iter_hits(door_id, zero_nibbles, processes=processes):
             yield h_hex
+    finally:
+        hit_index.close()
+
+
+@instrument.timed
+@utils.cached
+def get_passwords(door_id, length, zero_nibbles=ZERO_NIBBLES, max_iterations=100,
+                  kinds=PASSWORD_KINDS):
+    """The password of each of kinds, 'first' and/or 'ordered', filled in from a single scan of
+    the first max_iterations zero hashes. The scan stops once every password asked for is full"""
+    if not kinds or not set(kinds) <= set(PASSWORD_KINDS):
+        raise ValueError('PASSWORD KINDS MUST BE FROM %r: %r' % (PASSWORD_KINDS, kinds))
+    passwords = {kind: ['-'] * length for kind in kinds}
+    pwd = passwords.get('first')
+    ordered_pwd = passwords.get('ordered')
+
+    zero_hashes = zero_hash_generator(door_id, zero_nibbles)
+    for i, h_hex in enumerate(itertools.islice(zero_hashes, max_iterations)):
+        if pwd is not None and i < length:
+            pwd[i] = h_hex[zero_nibbles]
+            print(''.join(pwd))
+
+        position, letter = h_hex[zero_nibbles], h_hex[zero_nibbles + 1]
+        if (ordered_pwd is not None and position.isdigit() and int(position) < length
+                and ordered_pwd[int(position)] == '-'):
+            ordered_pwd[int(position)] = letter
+            print(''.join(ordered_pwd))
+
+        if all('-' not in password for password in passwords.values()):
+            zero_hashes.close()
+            print('\n')
+            return tuple(''.join(passwords[kind]) for kind in kinds)
 
-    raise Exception('INDEX HIGHER THAN %d' % index_limit)
-
-
-def get_password(door_id, length):
-    zero_hashes = zero_hash_generator(door_id)
-    pwd = ['-'] * length
-    for i in range(length):
-        h_hex = next(zero_hashes)
-        pwd[i] = h_hex[5]
-        print(''.join(pwd))
-
-    print('\n')
-    return ''.join(pwd)
-
+    raise Exception('PASSWORD NOT FOUND IN %d ITERATIONS' % max_iterations)
 
-def get_ordered_password(door_id, length):
-    max_iterations = 100
-    zero_hashes = zero_hash_generator(door_id)
-    pwd = ['-'] * length
 
-    for _ in range(max_iterations):
-        h_hex = next(zero_hashes)
-        position, letter = h_hex[5], h_hex[6]
-        try:
-            position = int(position)
-        except ValueError:
-            continue
+def get_password(door_id, length, zero_nibbles=ZERO_NIBBLES, max_iterations=100):
+    return get_passwords(door_id, length, zero_nibbles, max_iterations, kinds=('first',))[0]
 
-        if position < length and pwd[position] == '-':
-            pwd[position] = letter
-            result = ''.join(pwd)
-            print(result)
-            if '-' not in result:
-                print('\n')
-                return result
 
-    raise Exception('PASSWORD NOT FOUND IN %d ITERATIONS' % max_iterations)
+def get_ordered_password(door_id, length, zero_nibbles=ZERO_NIBBLES, max_iterations=100):
+    return get_passwords(door_id, length, zero_nibbles, max_iterations, kinds=('ordered',))[0]
 
 
 def run_tests():
@@ -126,5 +303,6 @@ if __name__ == '__main__':
     filename = 'dec05_input.txt'
     inputs = utils.read_file(filename)[0]
 
-    print('FIRST PASSWORD: %s' % get_password(inputs, 8))
-    print('ORDERED PASSWORD: %s' % get_ordered_password(inputs, 8))
+    password, ordered_password = get_passwords(inputs, 8)
+    print('FIRST PASSWORD: %s' % password)
+    print('ORDERED PASSWORD: %s' % ordered_password)
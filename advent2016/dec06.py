@@ -50,23 +50,105 @@ so on. Repeating this process for the remaining characters produces the original
 Given the recording in your puzzle input and this new decoding methodology, what is the original
 message that Santa is trying to send?
 """
-import collections
+import itertools
 
 import utils
 
+np = utils.lazy_import('numpy')
 
-def get_message(inputs, position=0):
-    num_letters = max([len(line) for line in inputs])
-    column_counters = [collections.Counter() for _ in range(num_letters)]
+# pads lines shorter than the longest, and is never counted
+PADDING = 0
+
+# lines loaded into an array at a time, when counting a stream of lines
+BLOCK_LINES = 2 ** 14
+
+
+def load_recording(inputs):
+    """Load message lines as an (N, width) uint8 array. Shorter lines are padded with PADDING"""
+    lines = list(inputs)
+    width = max(map(len, lines), default=0)
+    text = ''.join(lines)
+    if len(text) != width * len(lines):
+        text = ''.join(line.ljust(width, chr(PADDING)) for line in lines)
+    return np.frombuffer(text.encode(), dtype=np.uint8).reshape(len(lines), width)
+
+
+def get_column_counts(recording):
+    """(width, 256) table of how often each byte appears in each column, from a 2D bincount"""
+    num_lines, width = recording.shape
+    codes = recording.astype(np.int64) + np.arange(width) * 256
+    counts = np.bincount(codes.ravel(), minlength=width * 256).reshape(width, 256)
+    counts[:, PADDING] = 0
+    return counts
+
+
+def decode_message(counts, position=0):
+    """Pick the most (position 0) or least (position -1) common letter of each column. Ties go
+    to the lowest letter, and only letters that appear in a column can be the least common"""
+    if position == 0:
+        letters = counts.argmax(axis=1)
+    elif position == -1:
+        letters = np.where(counts > 0, counts, np.iinfo(counts.dtype).max).argmin(axis=1)
+    else:
+        raise ValueError('POSITION MUST BE 0 OR -1: %r' % position)
+
+    return bytes(letters.astype(np.uint8)).decode()
+
+
+class SignalDecoder:
+    """Running column counts of a signal that arrives a line or a batch of lines at a time.
+    Decoders built from parts of a signal, e.g. by several workers, can be merged"""
+
+    def __init__(self):
+        self.num_lines = 0
+        self.counts = np.zeros((0, 256), dtype=np.int64)
+
+    def update(self, lines):
+        """Count a single line, a batch of lines, or a recording from load_recording"""
+        if isinstance(lines, str):
+            lines = [lines]
+        recording = lines if isinstance(lines, np.ndarray) else load_recording(lines)
+        self.num_lines += len(recording)
+        self._add_counts(get_column_counts(recording))
+        return self
 
-    for line in inputs:
-        for i, letter in enumerate(line):
-            column_counters[i][letter] = column_counters[i].get(letter, 0) + 1
+    def merge(self, other):
+        """Add the counts of another decoder to this one"""
+        self.num_lines += other.num_lines
+        self._add_counts(other.counts)
+        return self
 
-    # most common returns a list of (value, count) tuples
-    # ordered by most to least recent
-    message = ''.join([cc.most_common()[position][0][0] for cc in column_counters])
-    return message
+    def _add_counts(self, counts):
+        # columns are added as longer lines arrive
+        if len(counts) > len(self.counts):
+            self.counts = np.vstack([self.counts, np.zeros((len(counts) - len(self.counts), 256),
+                                                           dtype=np.int64)])
+        self.counts[:len(counts)] += counts
+
+    def most_common_message(self):
+        return decode_message(self.counts, 0)
+
+    def least_common_message(self):
+        return decode_message(self.counts, -1)
+
+
+def count_columns(inputs, block_lines=BLOCK_LINES):
+    """get_column_counts of a recording, or of any iterable of lines. Lines are loaded block_lines
+    at a time into a SignalDecoder, so a stream of lines is counted in constant memory"""
+    if isinstance(inputs, np.ndarray):
+        return get_column_counts(inputs)
+
+    decoder = SignalDecoder()
+    line_iter = iter(inputs)
+    while True:
+        block = list(itertools.islice(line_iter, block_lines))
+        if not block:
+            return decoder.counts
+        decoder.update(block)
+
+
+def get_message(inputs, position=0):
+    return decode_message(count_columns(inputs), position)
 
 
 def run_tests():
@@ -80,12 +162,31 @@ def run_tests():
     act_res = get_message(seq, position=-1)
     assert act_res == res, 'MESSAGE BY LEAST COMMON LETTER: %r != %r (EXPECTED)' % (act_res, res)
 
+    # the last column only appears in two lines, and ties go to the lowest letter
+    seq = ['ab', 'ab', 'bac', 'cad', 'c']
+    res = 'aac', 'bac'
+    act_res = get_message(seq, position=0), get_message(seq, position=-1)
+    assert act_res == res, 'MESSAGES FROM UNEQUAL LINES: %r != %r (EXPECTED)' % (act_res, res)
+
+    # lines arriving one at a time, and in batches, to decoders that are then merged
+    decoder = SignalDecoder().update(seq[0])
+    for line in seq[1:3]:
+        decoder.update(line)
+    decoder.merge(SignalDecoder().update(seq[3:]))
+    act_res = decoder.most_common_message(), decoder.least_common_message(), decoder.num_lines
+    res = 'aac', 'bac', len(seq)
+    assert act_res == res, 'MERGED DECODER MESSAGES: %r != %r (EXPECTED)' % (act_res, res)
+
+    act_res = decode_message(count_columns(iter(seq), block_lines=2), 0)
+    assert act_res == 'aac', 'MESSAGE FROM BLOCKS: %r != %r (EXPECTED)' % (act_res, 'aac')
+
 
 if __name__ == '__main__':
     run_tests()
 
     filename = 'dec06_input.txt'
-    inputs = utils.read_file(filename)
 
-    print('MESSAGE BY MOST COMMON LETTER: %s' % get_message(inputs, 0))
-    print('MESSAGE BY LEAST COMMON LETTER: %s' % get_message(inputs, -1))
+    counts = count_columns(utils.iter_lines(filename))
+
+    print('MESSAGE BY MOST COMMON LETTER: %s' % decode_message(counts, 0))
+    print('MESSAGE BY LEAST COMMON LETTER: %s' % decode_message(counts, -1))
@@ -42,67 +42,71 @@ For example:
     zazbz[bzb]cdb supports SSL (zaz has no corresponding aza, but zbz has a corresponding bzb,
     even though zaz and zbz overlap).
 """
-import re
 import utils
 
-
-def has_four_letter_palindrome(message):
-    for i in range(len(message) - 3):
-        if message[i] == message[i + 1]:
-            continue
-        if message[i:i + 2] == message[i + 2:i + 4][::-1]:
-            return True
-
-    return False
+OPEN, CLOSE = ord('['), ord(']')
 
 
-def get_abas(message):
-    abas = set()
-    for i in range(len(message) - 2):
-        if message[i] == message[i + 2] and message[i] != message[i + 1]:
-            abas.add(message[i:i + 3])
-    return abas
+def classify(message):
+    """Whether an address supports TLS and SSL, from a single scan of its bytes. Every window of
+    four characters is checked for an ABBA, and its first three for an ABA, while tracking
+    whether the scan is inside a [hypernet] sequence"""
+    if isinstance(message, str):
+        message = message.encode()
 
+    # padded, so the ABA check also sees the last three characters
+    view = memoryview(message + b'\0')
+    in_hypernet = False
+    supernet_abba = hypernet_abba = False
+    # ABAs in the supernet sequences, and the ABAs that a BAB in a hypernet sequence matches,
+    # as (a << 8 | b)
+    supernet_abas = set()
+    hypernet_abas = set()
 
-def is_valid_tls(message):
-    split_message = re.split(r'[\[\]]', message)
+    for a, b, c, d in zip(view, view[1:], view[2:], view[3:]):
+        if a == OPEN or a == CLOSE:
+            # sequences alternate at every bracket, as if the address were split on them
+            in_hypernet = not in_hypernet
+        elif a == b or b == OPEN or b == CLOSE:
+            continue
+        elif a == c:
+            if in_hypernet:
+                hypernet_abas.add(b << 8 | a)
+            else:
+                supernet_abas.add(a << 8 | b)
+        elif b == c and a == d:
+            if in_hypernet:
+                hypernet_abba = True
+            else:
+                supernet_abba = True
 
-    # check [xxxx] hypernet sequences
-    for i in range(1, len(split_message), 2):
-        if has_four_letter_palindrome(split_message[i]):
-            return False
+    return supernet_abba and not hypernet_abba, not supernet_abas.isdisjoint(hypernet_abas)
 
-    # check remaining sequences
-    for i in range(0, len(split_message), 2):
-        if has_four_letter_palindrome(split_message[i]):
-            return True
 
-    return False
+def is_valid_tls(message):
+    return classify(message)[0]
 
 
 def is_valid_ssl(message):
-    split_message = re.split(r'[\[\]]', message)
+    return classify(message)[1]
 
-    hypernet_abas = set()
-    # check [xxxx] hypernet sequences
-    for i in range(1, len(split_message), 2):
-        hypernet_abas = hypernet_abas.union(get_abas(split_message[i]))
 
-    # check remaining sequences
-    for i in range(0, len(split_message), 2):
-        for aba in get_abas(split_message[i]):
-            bab = '%s%s%s' % (aba[1], aba[0], aba[1])
-            if bab in hypernet_abas:
-                return True
-    return False
+def count_messages(messages):
+    """Number of addresses supporting TLS, and SSL, from one pass over the messages"""
+    num_tls = num_ssl = 0
+    for message in messages:
+        tls, ssl = classify(message)
+        num_tls += tls
+        num_ssl += ssl
+    return num_tls, num_ssl
 
 
 def count_tls_messages(messages):
-    return sum([is_valid_tls(message) for message in messages])
+    return count_messages(messages)[0]
 
 
 def count_ssl_messages(messages):
-    return sum([is_valid_ssl(message) for message in messages])
+    return count_messages(messages)[1]
 
 
 def run_tests():
@@ -129,12 +133,19 @@ def run_tests():
         assert act_res == res, 'IS VALID MESSAGE SSH (%s): %r != %r (EXPECTED)' % \
                                (message, act_res, res)
 
+    # addresses can also be bytes, and both protocols are counted in one pass
+    messages = [b'abba[mnop]qrst', b'aba[bab]xyz', b'xyx[xyx]xyx']
+    res = 1, 1
+    act_res = count_messages(messages)
+    assert act_res == res, 'COUNT MESSAGES: %r != %r (EXPECTED)' % (act_res, res)
+
 
 if __name__ == '__main__':
     run_tests()
 
     filename = 'dec07_input.txt'
-    inputs = utils.read_file(filename)
 
-    print('NUMBER OF VALID TLS MESSAGES: %s' % count_tls_messages(inputs))
-    print('NUMBER OF VALID SSL MESSAGES: %s' % count_ssl_messages(inputs))
+    num_tls, num_ssl = count_messages(utils.iter_lines(filename))
+
+    print('NUMBER OF VALID TLS MESSAGES: %s' % num_tls)
+    print('NUMBER OF VALID SSL MESSAGES: %s' % num_ssl)
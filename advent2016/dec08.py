@@ -62,43 +62,30 @@ You notice that the screen is only capable of displaying capital letters; in the
 
 After you swipe your card, what code is the screen trying to display?
 """
-import numpy as np
 import utils
+from common import grid
 
+OFF, ON = 0, 1
 
-def rotate_column(screen, col, num_pixels):
-    new_screen = np.array(screen)
-    height = screen.shape[0]
-    if num_pixels <= 0:
-        return new_screen
-    new_screen[:num_pixels, col] = screen[height - num_pixels:, col]
-    new_screen[num_pixels:, col] = screen[:height - num_pixels, col]
 
-    return new_screen
+def rotate_column(screen, col, num_pixels):
+    screen.roll_column(col, num_pixels)
+    return screen
 
 
 def rotate_row(screen, row, num_pixels):
-    new_screen = np.array(screen)
-    width = screen.shape[1]
-    if num_pixels <= 0:
-        return new_screen
-    new_screen[row, :num_pixels] = screen[row, width - num_pixels:]
-    new_screen[row, num_pixels:] = screen[row, :width - num_pixels]
-
-    return new_screen
+    screen.roll_row(row, num_pixels)
+    return screen
 
 
 def rect(screen, width, height):
-    new_screen = np.array(screen)
-    if height <= 0 or width <= 0:
-        return new_screen
-
-    new_screen[:height, :width] = '#'
-    return new_screen
+    if height > 0 and width > 0:
+        screen.fill_rect(0, 0, width, height, ON)
+    return screen
 
 
 def get_screen(instructions, screen_width, screen_height):
-    screen = np.array(['.'] * screen_height * screen_width).reshape((screen_height, screen_width))
+    screen = grid.Grid(screen_width, screen_height, OFF, typecode='b')
 
     for instruction in instructions:
         action, *params = instruction.split(' ')
@@ -126,7 +113,11 @@ def get_screen(instructions, screen_width, screen_height):
 
 
 def count_screen_on(screen):
-    return np.sum(screen == '#')
+    return screen.count(ON)
+
+
+def render(screen):
+    return [''.join('#' if pixel == ON else '.' for pixel in row) for row in screen.rows()]
 
 
 def run_tests():
@@ -135,11 +126,11 @@ def run_tests():
                     'rotate row y=0 by 4',
                     'rotate column x=1 by 1']
 
-    res = np.array([['.', '#', '.', '.', '#', '.', '#'],
-                    ['#', '.', '#', '.', '.', '.', '.'],
-                    ['.', '#', '.', '.', '.', '.', '.']]).tolist()
+    res = ['.#..#.#',
+           '#.#....',
+           '.#.....']
 
-    act_res = get_screen(instructions, 7, 3).tolist()
+    act_res = render(get_screen(instructions, 7, 3))
     assert act_res == res, 'IS VALID MESSAGE: %r != %r (EXPECTED)' % (act_res, res)
 
     # res = 'advent'
@@ -157,5 +148,5 @@ if __name__ == '__main__':
     screen = get_screen(inputs, 50, 6)
     print('NUMBER OF LIT PIXELS: %s' % count_screen_on(screen))
     print('SCREEN MESSAGE:')
-    for row in screen:
-        print(''.join(row.tolist()))
+    for row in render(screen):
+        print(row)
@@ -53,45 +53,276 @@ the file; you'll have to come up with another way to get its decompressed length
 
 What is the decompressed length of the file using this improved format?
 """
+import bisect
+import collections
+import io
 import re
 import utils
 
-
-def get_next_marker_params(message):
-    pattern = r'\((?P<num_chars>\d+)x(?P<reps>\d+)\)'
-    match = re.search(pattern, message)
-    if match:
-        return int(match.group('num_chars')), int(match.group('reps'))
-
-    return None, None
-
-
-def decompress(message):
-    decompressed = []
-    i = 0
-
-    for _ in range(len(message)):
-
-        num_chars, reps = get_next_marker_params(message[i:])
-        if not num_chars:
-            # no more markers. keep rest of message
-            decompressed.append(message[i:])
-            break
-
-        marker = '(%dx%d)' % (num_chars, reps)
-        start_pos = message.find(marker, i)
-        end_pos = start_pos + len(marker) - 1
-
-        # add all characters before marker
-        decompressed.append(message[i:start_pos])
-        # add repeated characters
-        decompressed.append(message[end_pos + 1:end_pos + num_chars + 1] * reps)
-
-        i = end_pos + num_chars + 1
-        if i >= len(message):
-            break
-
-    return ''.join(decompressed)
+MARKER = re.compile(r'\((?P<num_chars>\d+)x(?P<reps>\d+)\)')
+# the same, for messages in bytes-like buffers, e.g. from utils.map_file
+MARKER_BYTES = re.compile(MARKER.pattern.encode())
+
+# characters of decompressed output per chunk when streaming
+CHUNK_SIZE = 64 * 1024
+
+# a region of a message in format version 2. Each part is either a (start, stop) slice of the
+# message that's copied as is, or a (reps, Span) repeated span. starts has the offset of each
+# part in the decompressed output, and length is the decompressed length of the region
+Span = collections.namedtuple('Span', ['starts', 'parts', 'length'])
+
+
+def decompress(message, version=1):
+    return ''.join(iter_decompress(message, version))
+
+
+def _repeat_blocks(span, reps, chunk_size):
+    # the span repeated reps times, in blocks of about chunk_size
+    if span:
+        block_reps = max(chunk_size // len(span), 1)
+        for rep in range(0, reps, block_reps):
+            yield span * min(block_reps, reps - rep)
+
+
+def iter_pieces(message, version=1, chunk_size=CHUNK_SIZE, start=0, stop=None):
+    """Decompressed output of message[start:stop] as a stream of pieces, in order. Repeated spans
+    are only built in memory if they fit in chunk_size. Longer spans are streamed by scanning them
+    once per repetition, so memory grows with the nesting depth of the markers rather than the
+    length of the output. Nested spans are kept on an explicit stack, so there's no limit to the
+    depth of nesting"""
+    stop = len(message) if stop is None else stop
+    i = start
+    # (start, stop, reps, pieces) of each span being expanded, innermost last. A span that fits in
+    # chunk_size collects its pieces to repeat in memory. A longer span has pieces None, and is
+    # streamed once per repetition, with reps counting down
+    frames = [(start, stop, 1, None)]
+
+    while frames:
+        span_start, span_stop, span_reps, pieces = frames[-1]
+        # a marker that runs past the end of its span is just data
+        match = MARKER.search(message, i, span_stop)
+        text_stop = match.start() if match else span_stop
+        if text_stop > i:
+            if pieces is None:
+                yield message[i:text_stop]
+            else:
+                pieces.append(message[i:text_stop])
+
+        if match:
+            num_chars, reps = int(match.group('num_chars')), int(match.group('reps'))
+            inner_start = match.end()
+            inner_stop = min(inner_start + num_chars, span_stop)
+
+            if version == 1:
+                blocks = _repeat_blocks(message[inner_start:inner_stop], reps, chunk_size)
+                if pieces is None:
+                    yield from blocks
+                else:
+                    pieces.extend(blocks)
+                i = inner_stop
+            elif pieces is None and (decompressed_length(message, 2, inner_start, inner_stop)
+                                     > chunk_size):
+                if reps:
+                    frames.append((inner_start, inner_stop, reps, None))
+                i = inner_start if reps else inner_stop
+            else:
+                # a span within a span that fits in chunk_size fits too
+                frames.append((inner_start, inner_stop, reps, []))
+                i = inner_start
+            continue
+
+        # the end of the span
+        frames.pop()
+        if pieces is None:
+            if span_reps > 1:
+                frames.append((span_start, span_stop, span_reps - 1, None))
+                i = span_start
+            else:
+                i = span_stop
+            continue
+
+        i = span_stop
+        blocks = _repeat_blocks(''.join(pieces), span_reps, chunk_size)
+        parent_pieces = frames[-1][3]
+        if parent_pieces is None:
+            yield from blocks
+        else:
+            parent_pieces.extend(blocks)
+
+
+def iter_decompress(message, version=1, chunk_size=CHUNK_SIZE):
+    """Decompressed output in chunks of chunk_size characters. Only the last chunk is shorter"""
+    buffer = ''
+    for piece in iter_pieces(message, version, chunk_size):
+        buffer += piece
+        if len(buffer) >= chunk_size:
+            num_full = len(buffer) - len(buffer) % chunk_size
+            for i in range(0, num_full, chunk_size):
+                yield buffer[i:i + chunk_size]
+            buffer = buffer[num_full:]
+
+    if buffer:
+        yield buffer
+
+
+def write_decompressed(message, fout, version=1, chunk_size=CHUNK_SIZE):
+    """Stream the decompressed output to a text or binary file object, e.g. from open() or
+    socket.makefile('wb'). Returns the number of characters written"""
+    binary = not isinstance(fout, io.TextIOBase)
+    length = 0
+    for chunk in iter_decompress(message, version, chunk_size):
+        fout.write(chunk.encode() if binary else chunk)
+        length += len(chunk)
+    return length
+
+
+def decompressed_length(message, version=1, start=0, stop=None):
+    """Length of message[start:stop] once decompressed, without building the output. In version 2,
+    markers within repeated data are decompressed too, so each character is counted once for every
+    repetition of the spans around it. Every character is scanned once, so this is linear in both
+    versions, and nested spans are kept on an explicit stack, so any depth of nesting is measured.
+    The message can also be a bytes-like buffer, so a mapped input file is scanned without a copy"""
+    marker = MARKER if isinstance(message, str) else MARKER_BYTES
+    stop = len(message) if stop is None else stop
+    length = 0
+    i = start
+    # (stop, repetitions) of each span being measured, innermost last. The repetitions of a span
+    # include those of every span around it
+    frames = [(stop, 1)]
+
+    while frames:
+        span_stop, span_reps = frames[-1]
+        # a marker that runs past the end of its span is just data
+        match = marker.search(message, i, span_stop)
+        if not match:
+            length += span_reps * (span_stop - i)
+            i = span_stop
+            frames.pop()
+            continue
+
+        num_chars, reps = int(match.group('num_chars')), int(match.group('reps'))
+        span_start = match.end()
+        inner_stop = min(span_start + num_chars, span_stop)
+
+        length += span_reps * (match.start() - i)
+        if version == 2:
+            frames.append((inner_stop, span_reps * reps))
+            i = span_start
+        else:
+            length += span_reps * reps * (inner_stop - span_start)
+            i = inner_stop
+
+    return length
+
+
+def build_span(message, start=0, stop=None):
+    """Index the parts of message[start:stop] in format version 2. Each marker is parsed once, and
+    nested spans are kept on an explicit stack, so any depth of nesting is indexed"""
+    stop = len(message) if stop is None else stop
+    starts, parts, length = [], [], 0
+    # (stop, starts, parts, length) of the span around each span being indexed, innermost last,
+    # and the reps of the span inside it
+    parents = []
+    i = start
+
+    while True:
+        match = MARKER.search(message, i, stop)
+        text_stop = match.start() if match else stop
+        if text_stop > i:
+            starts.append(length)
+            parts.append((i, text_stop))
+            length += text_stop - i
+
+        if match:
+            num_chars, reps = int(match.group('num_chars')), int(match.group('reps'))
+            span_start = match.end()
+            parents.append((stop, starts, parts, length, reps))
+            stop = min(span_start + num_chars, stop)
+            starts, parts, length = [], [], 0
+            i = span_start
+            continue
+
+        span = Span(starts, parts, length)
+        if not parents:
+            return span
+
+        i = stop
+        stop, starts, parts, length, reps = parents.pop()
+        if reps and span.length:
+            starts.append(length)
+            parts.append((reps, span))
+            length += reps * span.length
+
+
+class DecompressedReader:
+    """Random access reads from the version 2 decompressed output of a message, without expanding
+    anything before the offset. Each read descends the span index straight to the repetition
+    that contains the offset"""
+
+    def __init__(self, message):
+        self.message = message
+        self.root = build_span(message)
+        self.length = self.root.length
+
+    def read(self, offset, size):
+        """Up to size characters of decompressed output from offset"""
+        if offset < 0:
+            raise ValueError('OFFSET MUST NOT BE NEGATIVE: %d' % offset)
+        size = min(size, self.length - offset)
+
+        # reads still to do, as a stack of ops with the next op last. A whole repetition is read
+        # into a group of its own, which is then joined and repeated as many times as fit
+        ops = [('read', self.root, offset, size)] if size > 0 else []
+        groups = [[]]
+        while ops:
+            op = ops.pop()
+            if op[0] == 'read':
+                ops.extend(reversed(self._read_ops(*op[1:])))
+            elif op[0] == 'text':
+                groups[-1].append(op[1])
+            elif op[0] == 'group':
+                groups.append([])
+            else:
+                group = ''.join(groups.pop())
+                groups[-1].append(group * op[1])
+        return ''.join(groups[0])
+
+    def _read_ops(self, span, offset, size):
+        # ops to read size characters from offset in span, without descending into its children.
+        # size never runs past the end of span
+        ops = []
+        i = bisect.bisect_right(span.starts, offset) - 1
+        while size > 0:
+            part = span.parts[i]
+            part_offset = offset - span.starts[i]
+
+            if isinstance(part[1], Span):
+                reps, child = part
+                num_read = min(size, reps * child.length - part_offset)
+                rep_offset = part_offset % child.length
+                done = 0
+                while done < num_read:
+                    rep_size = min(num_read - done, child.length - rep_offset)
+                    if rep_size == child.length:
+                        # read a whole repetition once, and repeat it as many times as fit
+                        num_reps = (num_read - done) // child.length
+                        ops += [('group',), ('read', child, 0, rep_size), ('repeat', num_reps)]
+                        done += num_reps * rep_size
+                    else:
+                        ops.append(('read', child, rep_offset, rep_size))
+                        done += rep_size
+                    rep_offset = 0
+            else:
+                part_start, part_stop = part
+                num_read = min(size, part_stop - part_start - part_offset)
+                text_start = part_start + part_offset
+                ops.append(('text', self.message[text_start:text_start + num_read]))
+
+            offset += num_read
+            size -= num_read
+            i += 1
+
+        return ops
 
 
 def run_tests():
@@ -108,16 +339,52 @@ def run_tests():
         act_res = decompress(seq)
         assert act_res == res, 'DECOMPRESSED MESSAGE: %r != %r' % (act_res, res)
 
-        # res = 'advent'
-        # act_res = is_valid_message(message)
-        # assert act_res == res, 'MESSAGE BY LEAST COMMON LETTER: %r != %r (EXPECTED)' % (act_res, res)
+        act_res = decompressed_length(seq)
+        assert act_res == len(res), 'DECOMPRESSED LENGTH: %r != %r' % (act_res, len(res))
+
+    test_cases = [
+        ('(3x3)XYZ', 9),
+        ('X(8x2)(3x3)ABCY', 20),
+        ('(27x12)(20x12)(13x14)(7x10)(1x12)A', 241920),
+        ('(25x3)(3x3)ABC(2x3)XY(5x2)PQRSTX(18x9)(3x2)TWO(5x7)SEVEN', 445),
+    ]
+
+    for seq, res in test_cases:
+        act_res = decompressed_length(seq, version=2)
+        assert act_res == res, 'DECOMPRESSED LENGTH (V2): %r != %r' % (act_res, res)
+
+        act_res = decompressed_length(seq.encode(), version=2)
+        assert act_res == res, 'DECOMPRESSED LENGTH (V2, BYTES): %r != %r' % (act_res, res)
+
+        chunks = list(iter_decompress(seq, version=2, chunk_size=16))
+        act_res = [len(chunk) for chunk in chunks[:-1]], sum(len(chunk) for chunk in chunks)
+        assert act_res == ([16] * (len(chunks) - 1), res), 'CHUNKS (V2): %r' % (act_res,)
+
+    seq, res = 'X(8x2)(3x3)ABCY', 'XABCABCABCABCABCABCY'
+    act_res = decompress(seq, version=2)
+    assert act_res == res, 'DECOMPRESSED MESSAGE (V2): %r != %r' % (act_res, res)
+
+    fout = io.BytesIO()
+    act_res = write_decompressed(seq, fout, version=2, chunk_size=3), fout.getvalue()
+    assert act_res == (len(res), res.encode()), 'WRITTEN MESSAGE (V2): %r' % (act_res,)
+
+    seq = '(25x3)(3x3)ABC(2x3)XY(5x2)PQRSTX(18x9)(3x2)TWO(5x7)SEVEN'
+    res = decompress(seq, version=2)
+    reader = DecompressedReader(seq)
+    for offset, size in [(0, 445), (7, 20), (100, 3), (440, 10), (445, 1)]:
+        act_res = reader.read(offset, size)
+        assert act_res == res[offset:offset + size], 'READ %d+%d (V2): %r' % (offset, size, act_res)
 
 
 if __name__ == '__main__':
     run_tests()
 
     filename = 'dec09_input.txt'
-    inputs = ''.join(utils.read_file(filename))
-
-    decompressed_message = decompress(inputs)
-    print('LENGTH OF DECOMPRESSED MESSAGE: %d' % len(decompressed_message))
+    with utils.map_file(filename) as inputs:
+        # the message is a single line, so leave out the line ending
+        stop = inputs.find(b'\n')
+        stop = len(inputs) if stop < 0 else stop
+
+        print('LENGTH OF DECOMPRESSED MESSAGE: %d' % decompressed_length(inputs, stop=stop))
+        print('LENGTH OF DECOMPRESSED MESSAGE (V2): %d'
+              % decompressed_length(inputs, version=2, stop=stop))
@@ -103,23 +103,36 @@ class Bot(ChipRecipient):
         self._chips = []
 
 
-def parse_instruction(instruction):
-    re_value = r'(?P<type>value) (?P<value_num>\d+) goes to (?P<recipient_type>\w+) (?P<recipient_num>\d+)'
-    re_bot = r'(?P<type>bot) (?P<value_num>\d+) gives low to (?P<low_recipient_type>\w+) (?P<low_recipient_num>\d+)' \
-             r' and high to (?P<high_recipient_type>\w+) (?P<high_recipient_num>\d+)'
+RE_VALUE = re.compile(r'(?P<type>value) (?P<value_num>\d+) goes to (?P<recipient_type>\w+) (?P<recipient_num>\d+)')
+RE_BOT = re.compile(r'(?P<type>bot) (?P<value_num>\d+) gives low to (?P<low_recipient_type>\w+) (?P<low_recipient_num>\d+)'
+                    r' and high to (?P<high_recipient_type>\w+) (?P<high_recipient_num>\d+)')
+
 
-    m_value = re.match(re_value, instruction)
+def parse_instruction(instruction):
+    """Parse an instruction into a tuple of either:
+    ('value', value_num, recipient_type, recipient_num) or
+    ('bot', value_num, low_recipient_type, low_recipient_num, high_recipient_type, high_recipient_num)"""
+    m_value = RE_VALUE.match(instruction)
     if m_value:
-        return m_value.groupdict()
+        return ('value', int(m_value.group('value_num')),
+                m_value.group('recipient_type'), int(m_value.group('recipient_num')))
 
-    m_bot = re.match(re_bot, instruction)
+    m_bot = RE_BOT.match(instruction)
     if m_bot:
-        return m_bot.groupdict()
+        return ('bot', int(m_bot.group('value_num')),
+                m_bot.group('low_recipient_type'), int(m_bot.group('low_recipient_num')),
+                m_bot.group('high_recipient_type'), int(m_bot.group('high_recipient_num')))
 
     raise Exception(f'Instruction did not match bot or value: {instruction}')
 
 
+def parse_instructions(instructions):
+    # e.g. for utils.read_parsed
+    return [parse_instruction(instruction) for instruction in instructions]
+
+
 def run(instructions):
+    """Run raw instruction lines, or instructions already parsed by parse_instructions"""
 
     recipients = {
         'bot': defaultdict(Bot),
@@ -127,24 +140,20 @@ def run(instructions):
     }
 
     for instruction in instructions:
-        task = parse_instruction(instruction)
-        if task['type'] == 'value':
-
-            recipient_num = int(task['recipient_num'])
-            value_num = int(task['value_num'])
+        task = parse_instruction(instruction) if isinstance(instruction, str) else instruction
+        if task[0] == 'value':
+            _, value_num, recipient_type, recipient_num = task
 
-            recipients[task['recipient_type']][recipient_num].number = recipient_num
-            recipients[task['recipient_type']][recipient_num].add(value_num)
+            recipients[recipient_type][recipient_num].number = recipient_num
+            recipients[recipient_type][recipient_num].add(value_num)
 
-        elif task['type'] == 'bot':
-            l_recipient_num = int(task['low_recipient_num'])
-            h_recipient_num = int(task['high_recipient_num'])
-            value_num = int(task['value_num'])
+        elif task[0] == 'bot':
+            _, value_num, l_recipient_type, l_recipient_num, h_recipient_type, h_recipient_num = task
 
             recipients['bot'][value_num].number = value_num
             recipients['bot'][value_num].update_recipients(
-                low_recipient=recipients[task['low_recipient_type']][l_recipient_num],
-                high_recipient=recipients[task['high_recipient_type']][h_recipient_num]
+                low_recipient=recipients[l_recipient_type][l_recipient_num],
+                high_recipient=recipients[h_recipient_type][h_recipient_num]
             )
 
     results = [recipients['output'][i].chips[0] for i in range(3)]
@@ -154,6 +163,6 @@ def run(instructions):
 
 if __name__ == '__main__':
     filename = 'dec10_input.txt'
-    instructions = utils.read_file(filename)
+    instructions = utils.read_parsed(filename, parse_instructions)
 
     run(instructions)
@@ -52,28 +52,59 @@ initialized to the position of the ignition key.
 If you instead initialize register c to be 1, what value is now left in register a?
 """
 
+import collections
+
 import utils
+from common import instrument
+
+
+REGISTER_NAMES = 'abcd'
+
+
+def parse_instruction(instruction):
+    """Split an instruction into (instruction, *params), with integer literals converted to int"""
+    instruction, *params = instruction.split()
+    return (instruction, *[p if p in REGISTER_NAMES else int(p) for p in params])
+
 
+def parse_instructions(instructions):
+    # e.g. for utils.read_parsed
+    return tuple(parse_instruction(instruction) for instruction in instructions)
 
+
+@instrument.timed
+@utils.cached
 def get_registers(instructions, init_a=0, init_b=0, init_c=0, init_d=0):
+    """Run raw instruction lines, or instructions already parsed by parse_instructions"""
     registers = {'a': init_a, 'b': init_b, 'c': init_c, 'd': init_d}
     max_iterations = 10 ** 9
     step = 0
 
+    # parse once, rather than splitting each instruction every time it runs
+    program = [parse_instruction(i) if isinstance(i, str) else i for i in instructions]
+
+    # instructions executed per opcode, only counted when instrumented
+    executed = collections.Counter() if instrument.enabled else None
+
     for _ in range(max_iterations):
 
-        if step >= len(instructions):
+        if step >= len(program):
+            for opcode, num_executed in (executed or {}).items():
+                instrument.count('dec12.executed.%s' % opcode, num_executed)
             return registers
 
-        instruction, *params = instructions[step].split()
+        instruction, *params = program[step]
         step_increase = 1
 
+        if executed is not None:
+            executed[instruction] += 1
+
         if instruction == 'cpy':
             value, target = params
             if value in registers:
                 registers[target] = registers[value]
             else:
-                registers[target] = int(value)
+                registers[target] = value
 
         elif instruction == 'inc':
             target = params[0]
@@ -85,8 +116,8 @@ def get_registers(instructions, init_a=0, init_b=0, init_c=0, init_d=0):
 
         elif instruction == 'jnz':
             target, value = params
-            if registers.get(target, -1) != 0:
-                step_increase = int(value)
+            if registers.get(target, target) != 0:
+                step_increase = value
 
         step += step_increase
 
@@ -99,12 +130,15 @@ def run_tests():
     act_res = get_registers(seq)['a']
     assert act_res == res, 'VALUE OF REGISTER A: %r != %r (EXPECTED)' % (act_res, res)
 
+    act_res = get_registers(parse_instructions(seq))['a']
+    assert act_res == res, 'VALUE OF REGISTER A (PARSED): %r != %r (EXPECTED)' % (act_res, res)
+
 
 if __name__ == '__main__':
     run_tests()
 
     filename = 'dec12_input.txt'
-    inputs = utils.read_file(filename)
+    inputs = utils.read_parsed(filename, parse_instructions)
 
     print('REGISTERS AT END: %s' % get_registers(inputs))
     print('REGISTERS AT END, INITIAL C=1: %s' % get_registers(inputs, init_c=1))
@@ -51,8 +51,13 @@ Your puzzle input is 1352.
 
 How many locations (distinct x,y coordinates, including your starting location) can you reach in at most 50 steps?
 """
+import utils
+from common import grid, instrument
 
-maze = {}
+# locations that haven't been checked yet are UNKNOWN
+UNKNOWN, OPEN, WALL = 0, 1, 2
+
+maze = grid.Grid(typecode='b')
 
 
 def get_function(favourite_number):
@@ -68,31 +73,27 @@ def get_function(favourite_number):
 
 
 def get_moves(location, func):
-    global maze
     moves = []
-    for i, j in ([-1, 0], [0, -1], [1, 0], [0, 1]):
-
-        move = (location[0] + i, location[1] + j)
+    for move in maze.neighbours(*location):
 
-        if move not in maze:
-            maze[move] = func(*move)
+        value = maze.get(*move, UNKNOWN)
+        if value == UNKNOWN:
+            value = OPEN if func(*move) else WALL
+            maze[move] = value
 
-        if maze[move]:
+        if value == OPEN:
             moves.append(move)
 
     return moves
 
 
 def print_maze(num_moves):
-    results = [[' '] * num_moves for _ in range(num_moves)]
-    for move, value in maze.items():
-        if not value:
-            results[move[1]][move[0]] = '#'
-        else:
-            results[move[1]][move[0]] = '.'
-    print('\n'.join([''.join([r for r in result]) for result in results]))
+    symbols = {UNKNOWN: ' ', OPEN: '.', WALL: '#'}
+    print('\n'.join([''.join([symbols[maze.get(x, y, UNKNOWN)] for x in range(num_moves)])
+                     for y in range(num_moves)]))
 
 
+@instrument.timed
 def run(favourite_number, target=None, max_moves=1000):
     paths = [
         [(1, 1)],
@@ -100,6 +101,8 @@ def run(favourite_number, target=None, max_moves=1000):
     func = get_function(favourite_number)
     for move_num in range(1, max_moves + 1):
 
+        # every path is expanded once per move
+        instrument.count('dec13.nodes_expanded', len(paths))
         new_paths = []
         while paths:
             path = paths.pop()
@@ -122,8 +125,7 @@ def run(favourite_number, target=None, max_moves=1000):
     if target:
         raise Exception(f'TARGET NOT REACHED AFTER MOVE {move_num}')
 
-    unique_moves = [k for k, v in maze.items() if v]
-    print(f'{len(unique_moves)} UNIQUE COORDINATES AFTER {move_num} MOVES')
+    print(f'{maze.count(OPEN)} UNIQUE COORDINATES AFTER {move_num} MOVES')
 
 
 if __name__ == '__main__':
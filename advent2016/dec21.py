@@ -121,75 +121,113 @@ def move(message, old_pos, new_pos):
     return message[:new_pos] + letter + message[new_pos:]
 
 
-def scramble(instructions, message):
+def parse_instruction(instruction):
+    """Parse an instruction into an (action, *params) tuple, with positions converted to int:
+    ('swap_position', X, Y), ('swap_letter', X, Y), ('rotate_left', X), ('rotate_right', X),
+    ('rotate_based', X), ('reverse', X, Y) or ('move', X, Y)"""
+    action, *params = instruction.split(' ')
+
+    if action == 'swap':
+        if params[0] == 'position':
+            # swap position X with position Y
+            return 'swap_position', int(params[1]), int(params[4])
+
+        elif params[0] == 'letter':
+            # swap letter X with letter Y
+            return 'swap_letter', params[1], params[4]
+
+    elif action == 'rotate':
+        if params[0] == 'left':
+            # rotate left X steps
+            return 'rotate_left', int(params[1])
+
+        elif params[0] == 'right':
+            # rotate right X steps
+            return 'rotate_right', int(params[1])
+
+        elif params[0] == 'based':
+            # rotate based on position of letter X
+            return 'rotate_based', params[5]
+
+    elif action == 'reverse':
+        # reverse positions X through Y
+        return 'reverse', int(params[1]), int(params[3])
+
+    elif action == 'move':
+        # move position X to position Y
+        return 'move', int(params[1]), int(params[4])
+
+    raise Exception('UNKNOWN INSTRUCTION: %s' % instruction)
+
+
+def parse_instructions(instructions):
+    # e.g. for utils.read_parsed
+    return [parse_instruction(instruction) for instruction in instructions]
+
+
+def iter_instructions(instructions):
+    # accept raw instruction lines, or instructions already parsed by parse_instructions
     for instruction in instructions:
-        action, *params = instruction.split(' ')
+        yield parse_instruction(instruction) if isinstance(instruction, str) else instruction
+
+
+def scramble(instructions, message):
+    for action, *params in iter_instructions(instructions):
 
-        if action == 'swap':
-            if params[0] == 'position':
-                # swap position X with position Y
-                message = swap_position(message, int(params[1]), int(params[4]))
+        if action == 'swap_position':
+            message = swap_position(message, params[0], params[1])
 
-            elif params[0] == 'letter':
-                # swap letter X with letter Y
-                message = swap_letter(message, params[1], params[4])
+        elif action == 'swap_letter':
+            message = swap_letter(message, params[0], params[1])
 
-        elif action == 'rotate':
-            if params[0] == 'left':
-                # rotate left X steps
-                message = rotate_left(message, int(params[1]))
+        elif action == 'rotate_left':
+            message = rotate_left(message, params[0])
 
-            elif params[0] == 'right':
-                # rotate right X steps
-                message = rotate_right(message, int(params[1]))
+        elif action == 'rotate_right':
+            message = rotate_right(message, params[0])
 
-            elif params[0] == 'based':
-                # rotate based on position of letter X
-                message = rotate_by_position(message, params[5])
+        elif action == 'rotate_based':
+            message = rotate_by_position(message, params[0])
 
         elif action == 'reverse':
-            # reverse positions X through Y
-            message = reverse(message, int(params[1]), int(params[3]))
+            message = reverse(message, params[0], params[1])
 
         elif action == 'move':
-            # move position X to position Y
-            message = move(message, int(params[1]), int(params[4]))
+            message = move(message, params[0], params[1])
 
     return message
 
 
 def unscramble(instructions, message):
-    for instruction in instructions:
-        action, *params = instruction.split(' ')
-        if action == 'swap':
-            if params[0] == 'position':
-                # reverse: swap position X with position Y
-                message = swap_position(message, int(params[4]), int(params[1]))
+    for action, *params in iter_instructions(instructions):
+
+        if action == 'swap_position':
+            # reverse: swap position X with position Y
+            message = swap_position(message, params[1], params[0])
 
-            elif params[0] == 'letter':
-                # reverse: swap letter X with letter Y
-                message = swap_letter(message, params[4], params[1])
+        elif action == 'swap_letter':
+            # reverse: swap letter X with letter Y
+            message = swap_letter(message, params[1], params[0])
 
-        elif action == 'rotate':
-            if params[0] == 'left':
-                # reverse: rotate left X steps
-                message = rotate_right(message, int(params[1]))
+        elif action == 'rotate_left':
+            # reverse: rotate left X steps
+            message = rotate_right(message, params[0])
 
-            elif params[0] == 'right':
-                # reverse: rotate right X steps
-                message = rotate_left(message, int(params[1]))
+        elif action == 'rotate_right':
+            # reverse: rotate right X steps
+            message = rotate_left(message, params[0])
 
-            elif params[0] == 'based':
-                # reverse: rotate based on position of letter X
-                message = reverse_rotate_by_position(message, params[5])
+        elif action == 'rotate_based':
+            # reverse: rotate based on position of letter X
+            message = reverse_rotate_by_position(message, params[0])
 
         elif action == 'reverse':
             # reverse: reverse positions X through Y
-            message = reverse(message, int(params[1]), int(params[3]))
+            message = reverse(message, params[0], params[1])
 
         elif action == 'move':
             # reverse: move position X to position Y
-            message = move(message, int(params[4]), int(params[1]))
+            message = move(message, params[1], params[0])
 
     return message
 
@@ -216,12 +254,16 @@ def run_tests():
     act_res = unscramble(instructions[::-1], scrambled_message)
     assert act_res == message, 'UNSCRAMBLED MESSAGE: %r != %r (EXPECTED)' % (act_res, message)
 
+    act_res = scramble(parse_instructions(instructions), message)
+    assert act_res == scrambled_message, 'SCRAMBLED MESSAGE (PARSED): %r != %r (EXPECTED)' % \
+                                         (act_res, scrambled_message)
+
 
 if __name__ == '__main__':
     run_tests()
 
     filename = 'dec21_input.txt'
-    inputs = utils.read_file(filename)
+    inputs = utils.read_parsed(filename, parse_instructions)
 
     print('SCRAMBLED MESSAGE: %s' % (scramble(inputs, 'abcdefgh')))
     print('UNSCRAMBLED MESSAGE: %s' % (unscramble(inputs[::-1], 'fbgdceah')))
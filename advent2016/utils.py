@@ -1,4 +1,166 @@
+import contextlib
+import functools
+import hashlib
+import importlib.util
+import mmap
+import os
+import pickle
+import sys
+
+# solvers are run as scripts from their own directory, so put the repository root on sys.path for
+# the helpers that every year shares, e.g. `from common import grid`
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+CACHE_MAX_BYTES = 64 * 1024 ** 2
+
+# set this environment variable to bypass the result cache
+NO_CACHE_ENV = 'ADVENT_NO_CACHE'
+
+
 def read_file(filename, line_delimiter='\n'):
     with open(filename, 'r') as fin:
         text = fin.read().strip()
     return text.split(line_delimiter)
+
+
+def iter_lines(filename):
+    """Lazily read a file one line at a time, without line endings. Blank lines are skipped"""
+    with open(filename, 'r') as fin:
+        for line in fin:
+            line = line.rstrip('\r\n')
+            if line:
+                yield line
+
+
+@contextlib.contextmanager
+def map_file(filename):
+    """Memory map a file as a read-only bytes buffer, e.g. for single line inputs"""
+    with open(filename, 'rb') as fin:
+        with mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
+
+
+def read_array(filename, dtype=int, columns=None):
+    """Read a file of whitespace separated numbers straight into a NumPy array"""
+    import numpy as np
+
+    values = np.fromfile(filename, dtype=dtype, sep=' ')
+    if columns:
+        values = values.reshape(-1, columns)
+    return values
+
+
+def lazy_import(name):
+    """Import a module on first attribute access, so slow imports (e.g. numpy) don't add to
+    the start up time of solvers that never use them"""
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def cached(func):
+    """Cache a function's results on disk, keyed on a hash of its module's source and its
+    arguments (which include the puzzle input), so unchanged solvers on unchanged inputs return
+    immediately. The whole module is hashed, as the function's result also depends on the helpers
+    it calls.
+    The least recently used results are evicted once the cache exceeds CACHE_MAX_BYTES.
+    Set the ADVENT_NO_CACHE environment variable to bypass the cache"""
+    # the source is read on the first call, rather than while the solver is imported
+    source = []
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if os.environ.get(NO_CACHE_ENV):
+            return func(*args, **kwargs)
+
+        if not source:
+            import inspect
+
+            module = inspect.getmodule(func)
+            source.extend([os.path.basename(inspect.getsourcefile(module)),
+                           inspect.getsource(module)])
+        source_file, module_source = source
+        key_data = pickle.dumps((source_file, func.__qualname__, module_source, args,
+                                 sorted(kwargs.items())))
+        filename = os.path.join(CACHE_DIR, hashlib.sha256(key_data).hexdigest() + '.pickle')
+
+        try:
+            with open(filename, 'rb') as fin:
+                result = pickle.load(fin)
+            # mark as recently used
+            os.utime(filename)
+            return result
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+
+        result = func(*args, **kwargs)
+
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        write_pickle(filename, result)
+
+        evict_cache()
+        return result
+
+    return wrapper
+
+
+def evict_cache(max_bytes=None):
+    """Remove the least recently used cached results until the cache fits in max_bytes"""
+    max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    entries = []
+    for entry in os.scandir(CACHE_DIR):
+        if entry.name.endswith('.pickle'):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total_bytes = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_bytes <= max_bytes:
+            break
+        with contextlib.suppress(OSError):
+            os.remove(path)
+        total_bytes -= size
+
+
+def write_pickle(filename, data):
+    """Atomically write data to a pickle file, so readers never see a partial file"""
+    temp_filename = '%s.%d.tmp' % (filename, os.getpid())
+    with open(temp_filename, 'wb') as fout:
+        pickle.dump(data, fout, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_filename, filename)
+
+
+def read_parsed(filename, parse):
+    """Read a file and parse its lines with parse(lines), via a binary sidecar file next to the
+    input (filename.parsed). The sidecar is only rebuilt when the text or the parser's module
+    changes, so repeated runs skip parsing"""
+    import inspect
+
+    with open(filename, 'rb') as fin:
+        raw = fin.read()
+
+    parser_source = inspect.getsource(inspect.getmodule(parse)).encode()
+    key = hashlib.sha256(raw + parse.__qualname__.encode() + parser_source).hexdigest()
+
+    sidecar = filename + '.parsed'
+    try:
+        with open(sidecar, 'rb') as fin:
+            stored_key, data = pickle.load(fin)
+        if stored_key == key:
+            return data
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        pass
+
+    data = parse(raw.decode().strip().split('\n'))
+    write_pickle(sidecar, (key, data))
+    return data
@@ -57,18 +57,18 @@ def get_max_min_checksum(records):
     """Calculate the checksum from the input records,
     which is the total of the difference between the max and min value of each row.
     
-    :param list(list(int)) records: rows of integers  
+    :param list(list(int)) records: rows of integers. Any iterable of rows, e.g. a generator  
     :return: checksum
     :rtype: int
     """
-    return sum([max(row) - min(row) for row in records])
+    return sum(max(row) - min(row) for row in records)
 
 
 def get_divisible_checksum(records):
     """Calculate the checksum from the input records,
     which is the quotient of all divisible values in each row
     
-    :param list(list(int)) records: row of integers 
+    :param list(list(int)) records: row of integers. Any iterable of rows, e.g. a generator 
     :return: checksum
     :rtype: int
     """
@@ -88,8 +88,7 @@ def get_divisible_checksum(records):
 if __name__ == '__main__':
     import utils
 
-    input = utils.read_file(r'../inputs/dec02_input.txt')
-    formatted_input = [[int(item) for item in line.split()] for line in input]
+    formatted_input = utils.read_array(r'../inputs/dec02_input.txt', rows=True)
 
     max_min_checksum = get_max_min_checksum(formatted_input)
     print(f'The total max-min checksum is: {max_min_checksum}')
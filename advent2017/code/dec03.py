@@ -51,6 +51,12 @@ Once a square is written, its value does not change. Therefore, the first few sq
 
 What is the first value written that is larger than your puzzle input?
 """
+try:
+    from common import grid
+except ImportError:
+    # run as a script: utils puts the repository root on sys.path
+    import utils
+    from common import grid
 
 
 def get_steps():
@@ -93,13 +99,13 @@ def get_neighbour_values(spiral, pos_x, pos_y):
     """Calculate the sum of all neighbouring values to the current spiral position.
     Neighbours include all 4 sides, and all 4 diagonals.
     
-    :param dict(tuple: int) spiral: value at each position of the spiral 
+    :param grid.Grid spiral: value at each position of the spiral. Unset positions are 0
     :param int pos_x: position in the x direction 
     :param int pos_y: position in the y direction
     :return: sum of neighbour values
     :rtype: int
     """
-    return sum([spiral.get((pos_x + x, pos_y + y), 0) for x in [-1, 0, 1] for y in [-1, 0, 1] if (x, y) != (0, 0)])
+    return sum(spiral.neighbour_values(pos_x, pos_y, diagonal=True))
 
 
 def get_spiral_sum_value(square_value):
@@ -119,7 +125,8 @@ def get_spiral_sum_value(square_value):
     pos_x, pos_y = 0, 0
     dir_i = 0
     directions = [[1, 0], [0, 1], [-1, 0], [0, -1]]
-    spiral = {(0, 0): 1}
+    spiral = grid.Grid(typecode='q')
+    spiral[0, 0] = 1
 
     for step in get_steps():
         for _ in range(step):
@@ -129,7 +136,7 @@ def get_spiral_sum_value(square_value):
 
             if value >= square_value:
                 return value
-            spiral[(pos_x, pos_y)] = value
+            spiral[pos_x, pos_y] = value
 
         # change direction
         dir_i = (dir_i + 1) % len(directions)
@@ -68,31 +68,30 @@ def is_unique_letters(line):
 def get_num_unique_word_lines(input):
     """Get the number of word lists with unique words
     
-    :param list(list(str)) input: a list of word lists
+    :param list(list(str)) input: a list of word lists. Any iterable of word lists, e.g. a generator
     :return: the number of word lists with unique words
     :rtype: int
     """
-    return sum([1 for line in input if is_unique_words(line)])
+    return sum(1 for line in input if is_unique_words(line))
 
 
 def get_num_unique_letter_lines(input):
     """Get the number of word lists with unique letters in each word
 
-    :param list(list(str)) input: a list of word lists
+    :param list(list(str)) input: a list of word lists. Any iterable of word lists, e.g. a generator
     :return: the number of word lists with unique letters in each word
     :rtype: int
     """
-    return sum([1 for line in input if is_unique_letters(line)])
+    return sum(1 for line in input if is_unique_letters(line))
 
 
 if __name__ == '__main__':
     import utils
 
-    input = utils.read_file(r'../inputs/dec04_input.txt')
-    formatted_input = [line.split() for line in input]
+    filename = r'../inputs/dec04_input.txt'
 
-    num_unique_words = get_num_unique_word_lines(formatted_input)
+    num_unique_words = get_num_unique_word_lines(line.split() for line in utils.iter_lines(filename))
     print(f'The number of lines with unique words is: {num_unique_words}')
 
-    num_unique_letters = get_num_unique_letter_lines(formatted_input)
+    num_unique_letters = get_num_unique_letter_lines(line.split() for line in utils.iter_lines(filename))
     print(f'The number of lines with unique letters in each word is: {num_unique_letters}')
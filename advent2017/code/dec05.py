@@ -50,6 +50,13 @@ How many steps does it now take to reach the exit?
 
 from collections import defaultdict
 
+try:
+    from common import instrument
+except ImportError:
+    # run as a script: utils puts the repository root on sys.path
+    import utils
+    from common import instrument
+
 
 class InstructionJumps:
 
@@ -62,6 +69,7 @@ class InstructionJumps:
         """
         return 1
 
+    @instrument.timed
     def get_num_exit_moves(self, instructions, max_moves=10**8):
         """Find the number of moves required to exit the instruction list.
         Once an instruction is followed, it is offset by get_offset_increase
@@ -80,6 +88,7 @@ class InstructionJumps:
             this_index += jump_value
 
             if this_index >= len(instructions):
+                instrument.count('dec05.jumps', i)
                 return i
 
         raise Exception(f'Still inside instruction list after {i} jumps')
@@ -1,3 +1,13 @@
+import os
+import sys
+
+# solvers are run as scripts from their own directory, so put the repository root on sys.path for
+# the helpers that every year shares, e.g. `from common import grid`
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+
 def read_file(filename, line_delimiter='\n'):
     """Read the contents of a file
     
@@ -9,3 +19,40 @@ def read_file(filename, line_delimiter='\n'):
     with open(filename, 'r') as fin:
         text = fin.read().strip()
     return text.split(line_delimiter)
+
+
+def iter_lines(filename):
+    """Lazily read a file one line at a time, so large files are read in constant memory
+
+    :param str filename: full path to the text file to open
+    :return: each line of the file, without line endings. Blank lines are skipped
+    :rtype: generator(str)
+    """
+    with open(filename, 'r') as fin:
+        for line in fin:
+            line = line.rstrip('\r\n')
+            if line:
+                yield line
+
+
+def read_array(filename, dtype=int, columns=None, rows=False):
+    """Read a file of whitespace separated numbers straight into a NumPy array,
+    without building a Python string for each number
+
+    :param str filename: full path to the text file to open
+    :param dtype: NumPy data type of the values
+    :param int columns: reshape the values into rows of this many columns
+    :param bool rows: reshape the values into one row per line, as wide as the first line
+    :return: the values in the file
+    :rtype: numpy.ndarray
+    """
+    import numpy as np
+
+    if rows:
+        with open(filename, 'r') as fin:
+            columns = len(fin.readline().split())
+
+    values = np.fromfile(filename, dtype=dtype, sep=' ')
+    if columns:
+        values = values.reshape(-1, columns)
+    return values
@@ -21,3 +21,9 @@ def test_letters():
     _run_unique_letter_test(['a', 'ab', 'abc', 'abd', 'abf', 'abj'], True)
     _run_unique_letter_test(['iiii', 'oiii', 'ooii', 'oooi', 'oooo'], True)
     _run_unique_letter_test(['oiii', 'ioii', 'iioi', 'iiio', 'o'], False)
+
+
+def test_num_unique_lines():
+    lines = ['aa bb cc dd ee', 'aa bb cc dd aa', 'abcde xyz ecdab']
+    assert dec04.get_num_unique_word_lines(line.split() for line in lines) == 2
+    assert dec04.get_num_unique_letter_lines(line.split() for line in lines) == 1
@@ -0,0 +1,14 @@
+from advent2017.code import utils
+
+
+def test_iter_lines(tmpdir):
+    filename = tmpdir.join('input.txt')
+    filename.write('aa bb\n\ncc dd\n')
+    assert list(utils.iter_lines(str(filename))) == ['aa bb', 'cc dd']
+
+
+def test_read_array(tmpdir):
+    filename = tmpdir.join('input.txt')
+    filename.write('5\t1\t9\t5\n7\t5\t3\t1\n')
+    assert utils.read_array(str(filename), columns=4).tolist() == [[5, 1, 9, 5], [7, 5, 3, 1]]
+    assert utils.read_array(str(filename), rows=True).tolist() == [[5, 1, 9, 5], [7, 5, 3, 1]]
@@ -0,0 +1,203 @@
+"""Compact 2D grid of numbers, stored in a single flat array.
+
+Coordinates are (x, y), with x increasing to the right and y increasing downwards. The grid has
+an offset origin, so coordinates can be negative, and its bounds grow to include any position
+that is set outside them.
+"""
+import array
+
+# (dx, dy) offsets to the neighbours of a position
+ORTHOGONAL = ((-1, 0), (0, -1), (1, 0), (0, 1))
+DIAGONAL = ((-1, -1), (1, -1), (1, 1), (-1, 1))
+
+
+class Grid:
+
+    def __init__(self, width=0, height=0, fill=0, typecode='l', min_x=0, min_y=0):
+        """
+        :param int width: initial width
+        :param int height: initial height
+        :param int fill: value of every position that hasn't been set
+        :param str typecode: array typecode of the values, e.g. 'b' for small values
+        :param int min_x: x coordinate of the left column
+        :param int min_y: y coordinate of the top row
+        """
+        self.fill = fill
+        self.typecode = typecode
+        self.min_x, self.min_y = min_x, min_y
+        self.width, self.height = width, height
+        self.cells = array.array(typecode, [fill]) * (width * height)
+
+    @classmethod
+    def from_rows(cls, rows, fill=0, typecode='l'):
+        """Create a grid with the top left value at (0, 0)
+
+        :param list(list(int)) rows: values in each row. Short rows are padded with fill
+        :param int fill: value of every position that hasn't been set
+        :param str typecode: array typecode of the values
+        :return: new grid
+        :rtype: Grid
+        """
+        width = max(len(row) for row in rows)
+        grid = cls(width, len(rows), fill, typecode)
+        for y, row in enumerate(rows):
+            grid.cells[y * width:y * width + len(row)] = array.array(typecode, row)
+        return grid
+
+    def __contains__(self, position):
+        x, y = position
+        return 0 <= x - self.min_x < self.width and 0 <= y - self.min_y < self.height
+
+    def __getitem__(self, position):
+        x, y = position
+        if not (0 <= x - self.min_x < self.width and 0 <= y - self.min_y < self.height):
+            raise IndexError(f'{position!r} is outside the grid')
+        return self.cells[(y - self.min_y) * self.width + x - self.min_x]
+
+    def __setitem__(self, position, value):
+        x, y = position
+        if not (0 <= x - self.min_x < self.width and 0 <= y - self.min_y < self.height):
+            self.grow_to(x, y)
+        self.cells[(y - self.min_y) * self.width + x - self.min_x] = value
+
+    def get(self, x, y, default=None):
+        """Get the value at a position, without growing the grid
+
+        :param int x: position in the x direction
+        :param int y: position in the y direction
+        :param default: returned if the position is outside the grid
+        :return: value at the position
+        :rtype: int
+        """
+        if 0 <= x - self.min_x < self.width and 0 <= y - self.min_y < self.height:
+            return self.cells[(y - self.min_y) * self.width + x - self.min_x]
+        return default
+
+    def grow_to(self, x, y):
+        """Grow the bounds to include a position. The bounds at least double in each direction
+        they grow, so setting positions one at a time along an edge is amortised
+
+        :param int x: position in the x direction
+        :param int y: position in the y direction
+        """
+        min_x, min_y = self.min_x, self.min_y
+        max_x, max_y = min_x + self.width, min_y + self.height
+        if x < min_x:
+            min_x = min(x, min_x - max(self.width, 1))
+        elif x >= max_x:
+            max_x = max(x + 1, max_x + max(self.width, 1))
+        if y < min_y:
+            min_y = min(y, min_y - max(self.height, 1))
+        elif y >= max_y:
+            max_y = max(y + 1, max_y + max(self.height, 1))
+
+        grown = Grid(max_x - min_x, max_y - min_y, self.fill, self.typecode, min_x, min_y)
+        offset = (self.min_y - min_y) * grown.width + self.min_x - min_x
+        for row in range(self.height):
+            start = offset + row * grown.width
+            grown.cells[start:start + self.width] = self.cells[row * self.width:(row + 1) * self.width]
+
+        self.min_x, self.min_y = min_x, min_y
+        self.width, self.height = grown.width, grown.height
+        self.cells = grown.cells
+
+    def clear(self):
+        """Remove every position, leaving an empty grid"""
+        self.min_x = self.min_y = self.width = self.height = 0
+        self.cells = array.array(self.typecode)
+
+    @staticmethod
+    def neighbours(x, y, diagonal=False):
+        """Get the positions next to a position: left, up, right, down, then the diagonals
+
+        :param int x: position in the x direction
+        :param int y: position in the y direction
+        :param bool diagonal: include the 4 diagonal neighbours
+        :return: each neighbouring position
+        :rtype: iterator(tuple(int))
+        """
+        for dx, dy in ORTHOGONAL + DIAGONAL if diagonal else ORTHOGONAL:
+            yield x + dx, y + dy
+
+    def neighbour_values(self, x, y, diagonal=False):
+        """Get the values next to a position. Positions outside the grid have the fill value
+
+        :param int x: position in the x direction
+        :param int y: position in the y direction
+        :param bool diagonal: include the 4 diagonal neighbours
+        :return: value of each neighbouring position
+        :rtype: list(int)
+        """
+        return [self.get(nx, ny, self.fill) for nx, ny in self.neighbours(x, y, diagonal)]
+
+    def find(self, value):
+        """Find the first occurrence of a value, from top to bottom and left to right
+
+        :param int value: value to find
+        :return: position of the value
+        :rtype: tuple(int)
+        """
+        index = self.cells.index(value)
+        return self.min_x + index % self.width, self.min_y + index // self.width
+
+    def count(self, value):
+        return self.cells.count(value)
+
+    def rows(self):
+        """Get each row of values, from top to bottom
+
+        :return: values in each row
+        :rtype: iterator(array.array)
+        """
+        for row in range(self.height):
+            yield self.cells[row * self.width:(row + 1) * self.width]
+
+    def fill_rect(self, x, y, width, height, value):
+        """Set every position in a rectangle, clipped to the grid
+
+        :param int x: x coordinate of the top left corner
+        :param int y: y coordinate of the top left corner
+        :param int width: width of the rectangle
+        :param int height: height of the rectangle
+        :param int value: value to set
+        """
+        left, right = max(x - self.min_x, 0), min(x - self.min_x + width, self.width)
+        top, bottom = max(y - self.min_y, 0), min(y - self.min_y + height, self.height)
+        if left >= right:
+            return
+
+        values = array.array(self.typecode, [value]) * (right - left)
+        for row in range(top, bottom):
+            self.cells[row * self.width + left:row * self.width + right] = values
+
+    def roll_row(self, y, shift):
+        """Rotate a row to the right, wrapping around
+
+        :param int y: row to rotate
+        :param int shift: number of positions to move each value
+        """
+        start = (y - self.min_y) * self.width
+        row = self.cells[start:start + self.width]
+        shift %= self.width
+        self.cells[start:start + self.width] = row[self.width - shift:] + row[:self.width - shift]
+
+    def roll_column(self, x, shift):
+        """Rotate a column down, wrapping around
+
+        :param int x: column to rotate
+        :param int shift: number of positions to move each value
+        """
+        column_slice = slice(x - self.min_x, len(self.cells), self.width)
+        column = self.cells[column_slice]
+        shift %= self.height
+        self.cells[column_slice] = column[self.height - shift:] + column[:self.height - shift]
+
+    def to_array(self):
+        """Get a NumPy view of the values. The view shares memory with the grid until it grows
+
+        :return: values, with shape (height, width)
+        :rtype: numpy.ndarray
+        """
+        import numpy as np
+
+        return np.frombuffer(self.cells, dtype=self.typecode).reshape(self.height, self.width)
@@ -0,0 +1,118 @@
+"""Opt-in instrumentation of the solvers: domain counters and function timings.
+
+Instrumentation is disabled unless the ADVENT_INSTRUMENT environment variable is set to the path
+of a JSON report, which is written when the process exits. While disabled, count() returns
+immediately and @timed functions are called directly, so the overhead is negligible.
+"""
+import atexit
+import collections
+import functools
+import os
+import time
+
+REPORT_ENV = 'ADVENT_INSTRUMENT'
+
+enabled = False
+report_path = None
+counters = collections.Counter()
+timings = collections.defaultdict(lambda: {'calls': 0, 'total_time': 0.0})
+_start_time = None
+
+
+def enable(path=None):
+    """Start recording counters and timings
+
+    :param str path: write the report to this path on exit
+    """
+    global enabled, report_path, _start_time
+    enabled = True
+    report_path = path
+    _start_time = time.perf_counter()
+
+
+def disable():
+    """Stop recording counters and timings"""
+    global enabled
+    enabled = False
+
+
+def reset():
+    """Clear the counters and timings recorded so far"""
+    global _start_time
+    counters.clear()
+    timings.clear()
+    _start_time = time.perf_counter()
+
+
+def count(name, value=1):
+    """Add value to the named counter
+
+    :param str name: counter name
+    :param int value: amount to add
+    """
+    if enabled:
+        counters[name] += value
+
+
+def timed(func):
+    """Decorator to record the number of calls and total run time of a function
+
+    :param func: function to time
+    :return: the wrapped function
+    """
+    # name after the module the function is defined in, even if it's already wrapped
+    unwrapped = func
+    while hasattr(unwrapped, '__wrapped__'):
+        unwrapped = unwrapped.__wrapped__
+    source_file = unwrapped.__code__.co_filename
+    module_name = os.path.splitext(os.path.basename(source_file))[0]
+    name = f'{module_name}.{func.__qualname__}'
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not enabled:
+            return func(*args, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timing = timings[name]
+            timing['calls'] += 1
+            timing['total_time'] += time.perf_counter() - start
+
+    return wrapper
+
+
+def report():
+    """Get the counters and timings recorded so far
+
+    :return: elapsed time, counters, rates per second of elapsed time, and function timings
+    :rtype: dict
+    """
+    elapsed = time.perf_counter() - _start_time if _start_time is not None else 0.0
+    return {
+        'elapsed_time': elapsed,
+        'counters': dict(counters),
+        'rates': {name: value / elapsed for name, value in counters.items() if elapsed},
+        'timings': dict(timings),
+    }
+
+
+def write_report(path=None):
+    """Write the report as JSON
+
+    :param str path: report path. Defaults to the path the instrumentation was enabled with
+    """
+    path = path or report_path
+    if path:
+        # only imported when a report is written, to keep solver start up fast
+        import json
+
+        with open(path, 'w') as fout:
+            json.dump(report(), fout, indent=2, sort_keys=True)
+
+
+if os.environ.get(REPORT_ENV):
+    enable(os.environ[REPORT_ENV])
+    atexit.register(write_report)
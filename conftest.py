@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+from tools import solvers
+
+
+def pytest_addoption(parser):
+    parser.addoption('--run-slow', action='store_true', help='also run slow tests')
+    parser.addoption('--benchmark', action='store_true',
+                     help='run the performance regression tests against the stored baselines')
+    parser.addoption('--benchmark-threshold', type=float, default=2.0,
+                     help='fail when a solver is this many times slower than its baseline')
+    parser.addoption('--benchmark-update', action='store_true',
+                     help='store the measured timings as the new baselines')
+
+
+def pytest_configure(config):
+    # solver results are never read from, or written to, the on-disk cache during tests
+    os.environ.setdefault(solvers.NO_CACHE_ENV, '1')
+    config.addinivalue_line('markers', 'slow: slow test, only run with --run-slow')
+    config.addinivalue_line('markers', 'benchmark: performance test, only run with --benchmark')
+
+
+def pytest_collection_modifyitems(config, items):
+    run_benchmarks = config.getoption('--benchmark') or config.getoption('--benchmark-update')
+    for item in items:
+        if 'slow' in item.keywords and not config.getoption('--run-slow'):
+            item.add_marker(pytest.mark.skip(reason='slow test, use --run-slow to run'))
+        if 'benchmark' in item.keywords and not run_benchmarks:
+            item.add_marker(pytest.mark.skip(reason='performance test, use --benchmark to run'))
@@ -0,0 +1,180 @@
+"""Run the run_tests() examples built in to each 2016 solver, plus tests of solver internals"""
+import contextlib
+import hashlib
+import io
+import random
+
+import pytest
+
+from tools import generators, solvers
+
+SLOW_DAYS = [5]
+
+SOLVERS = [solver for solver in solvers.find_solvers([2016])
+           if hasattr(solvers.load_module(solver.year, solver.day), 'run_tests')]
+
+
+def _mark(solver):
+    marks = [pytest.mark.slow] if solver.day in SLOW_DAYS else []
+    return pytest.param(solver, marks=marks, id=solvers.solver_name(solver))
+
+
+@pytest.mark.parametrize('solver', [_mark(solver) for solver in SOLVERS])
+def test_run_tests(solver):
+    module = solvers.load_module(solver.year, solver.day)
+    # solvers print their progress
+    with contextlib.redirect_stdout(io.StringIO()):
+        module.run_tests()
+
+
+def _brute_force_hits(door_id, count, zero_nibbles):
+    hits = []
+    i = 0
+    while len(hits) < count:
+        h_hex = hashlib.md5(b'%s%d' % (door_id.encode(), i)).hexdigest()
+        if h_hex.startswith('0' * zero_nibbles):
+            hits.append((i, h_hex))
+        i += 1
+    return hits
+
+
+def test_dec05_hit_index(tmpdir):
+    dec05 = solvers.load_module(2016, 5)
+    hit_index = dec05.HitIndex(str(tmpdir.join('hits.sqlite')))
+
+    assert hit_index.next_hits('abc', 5, 2, processes=1) == _brute_force_hits('abc', 5, 2)
+    # the first range is looked up, and only the rest is mined
+    assert hit_index.next_hits('abc', 3, 3, processes=1) == _brute_force_hits('abc', 3, 3)
+    hits = _brute_force_hits('abc', 4, 2)
+    assert hit_index.next_hits('abc', 2, 2, start=hits[1][0] + 1, processes=1) == hits[2:]
+
+
+def test_dec05_get_password_alone(monkeypatch):
+    monkeypatch.setenv('ADVENT_NO_CACHE', '1')
+    dec05 = solvers.load_module(2016, 5)
+    hits = _brute_force_hits('abc', 11, 2)
+    # positions only go up to 9, so the ordered password of length 11 never fills
+    assert dec05.get_password('abc', 11, zero_nibbles=2) == ''.join(h_hex[2] for _, h_hex in hits)
+    with pytest.raises(Exception, match='PASSWORD NOT FOUND'):
+        dec05.get_ordered_password('abc', 11, zero_nibbles=2)
+
+
+def test_dec05_zero_bound():
+    dec05 = solvers.load_module(2016, 5)
+    assert dec05.zero_bound(32) == bytes(15) + b'\x01'
+    for zero_nibbles in (0, 33):
+        with pytest.raises(ValueError):
+            dec05.zero_bound(zero_nibbles)
+
+
+@pytest.mark.parametrize('processes', [1, 3])
+def test_dec05_iter_chunks(monkeypatch, processes):
+    dec05 = solvers.load_module(2016, 5)
+    # many small chunks, so the pool has several in flight and they can finish out of order
+    monkeypatch.setattr(dec05, 'CHUNK_SIZE', 500)
+    stop = 10 ** 4
+
+    chunks = list(dec05.iter_chunks('abc', processes, stop=stop, zero_nibbles=2))
+    assert [chunk_stop for chunk_stop, _ in chunks] == list(range(500, stop + 1, 500))
+    hits = [(i, digest.hex()) for _, chunk_hits in chunks for i, digest in chunk_hits]
+    assert hits == [hit for hit in _brute_force_hits('abc', len(hits) + 1, 2) if hit[0] < stop]
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_dec09_random_reads(seed):
+    dec09 = solvers.load_module(2016, 9)
+    message = generators.generate_2016_dec09(10 ** 4, seed=seed)
+    expected = dec09.decompress(message, version=2)
+    reader = dec09.DecompressedReader(message)
+
+    assert reader.length == len(expected)
+    rng = random.Random(seed)
+    for _ in range(100):
+        offset, size = rng.randrange(len(expected) + 10), rng.randrange(1000)
+        assert reader.read(offset, size) == expected[offset:offset + size]
+
+
+def _deep_message(depth):
+    # markers nested depth deep, most of them repeating once
+    message = 'AB'
+    for level in range(depth):
+        message = '(%dx%d)' % (len(message), 2 if level % 1000 == 0 else 1) + message
+    return message
+
+
+def test_dec09_deep_nesting():
+    dec09 = solvers.load_module(2016, 9)
+    message = _deep_message(3000)
+    assert dec09.decompressed_length(message, version=2) == 16
+    assert dec09.decompress(message, version=2) == 'AB' * 8
+    # stream the spans longer than 4 characters
+    chunks = dec09.iter_decompress(_deep_message(1200), 2, chunk_size=4)
+    assert list(chunks) == ['ABAB'] * 2
+    reader = dec09.DecompressedReader(message)
+    assert [reader.read(offset, 5) for offset in (0, 7, 14)] == ['ABABA', 'BABAB', 'AB']
+
+
+def test_dec09_negative_offset():
+    dec09 = solvers.load_module(2016, 9)
+    with pytest.raises(ValueError):
+        dec09.DecompressedReader('(3x3)XYZ').read(-2, 4)
+
+
+def test_dec03_parse_sides():
+    dec03 = solvers.load_module(2016, 3)
+    assert dec03.parse_sides(['3 4 5', ' 5 10  25']).tolist() == [[3, 4, 5], [5, 10, 25]]
+    # a short line doesn't borrow sides from the next
+    with pytest.raises(ValueError):
+        dec03.parse_sides(['3 4', '5 10 10 10'])
+
+
+@pytest.mark.parametrize('processes', [1, 3])
+def test_dec04_validate_file(tmpdir, processes):
+    dec04 = solvers.load_module(2016, 4)
+    lines = generators.generate_2016_dec04(2000, seed=1)
+    # a room that matches the default keywords, in the middle of the file
+    lines.insert(1000, 'zadftbaxq-anvqof-efadmsq-482[afqdb]')
+    filename = tmpdir.join('rooms.txt')
+    filename.write('\n'.join(lines) + '\n')
+
+    total, matches = dec04.validate_file(str(filename), processes=processes)
+    assert total == dec04.sum_real_sector_ids(lines)
+    assert matches == dec04.NameIndex(lines).search('northpole')
+    assert ('northpole object storage', 482) in matches
+
+
+def test_dec04_room_blocks():
+    dec04 = solvers.load_module(2016, 4)
+    lines = generators.generate_2016_dec04(100, seed=2)
+    # a generator of lines, validated in blocks of 7 rooms
+    total = dec04.sum_real_sector_ids((line for line in lines), block_rooms=7)
+    assert total == sum(dec04.get_real_sector_id(line) for line in lines)
+
+
+def test_dec04_parse_rooms():
+    dec04 = solvers.load_module(2016, 4)
+    assert dec04.parse_rooms(['aaaaa-bbb-z-y-x-123[abxyz]', '', 'a-b-987[ab]']) == [
+        ('aaaaa-bbb-z-y-x-', 123, 'abxyz'), ('a-b-', 987, 'ab')]
+    # lines aren't dropped, even if part of them looks like a room
+    with pytest.raises(ValueError, match='NOT A ROOM'):
+        dec04.parse_rooms(['aaaaa-bbb-z-y-x-123[abxyz]', 'xx a-b-987[ab] yy'])
+
+
+def test_dec04_shards(tmpdir):
+    dec04 = solvers.load_module(2016, 4)
+    filename = tmpdir.join('rooms.txt')
+    filename.write_binary(b'aaa\nbb\nc\n\ndddd\n')
+
+    shards = dec04.get_shards(str(filename), 4)
+    assert shards[0][0] == 0 and shards[-1][1] == 15
+    assert all(stop == start for (_, stop), (start, _) in zip(shards, shards[1:]))
+    # every shard starts on a line
+    assert all(start == 0 or filename.read_binary()[start - 1:start] == b'\n' for start, _ in shards)
+
+
+def test_dec06_count_blocks():
+    dec06 = solvers.load_module(2016, 6)
+    lines = generators.generate_2016_dec06(100, seed=3)
+    # a generator of lines, counted in blocks of 7 lines
+    counts = dec06.count_columns((line for line in lines), block_lines=7)
+    assert (counts == dec06.get_column_counts(dec06.load_recording(lines))).all()
@@ -0,0 +1,38 @@
+import pytest
+
+from common import grid
+
+
+def test_grow():
+    spiral = grid.Grid()
+    spiral[0, 0] = 1
+    spiral[-2, 3] = 2
+    assert spiral[0, 0] == 1
+    assert spiral[-2, 3] == 2
+    assert spiral.get(5, 5) is None
+    assert (5, 5) not in spiral
+    with pytest.raises(IndexError):
+        spiral[5, 5]
+
+
+def test_neighbour_values():
+    spiral = grid.Grid.from_rows([[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+    assert spiral.neighbour_values(0, 0) == [0, 0, 2, 4]
+    assert sum(spiral.neighbour_values(1, 1, diagonal=True)) == 40
+
+
+def test_find():
+    keypad = grid.Grid.from_rows([[0, 1, 0], [2, 3, 4]])
+    assert keypad.find(3) == (1, 1)
+    assert keypad.count(0) == 2
+
+
+def test_region_ops():
+    screen = grid.Grid(7, 3)
+    screen.fill_rect(0, 0, 3, 2, 1)
+    screen.roll_column(1, 1)
+    screen.roll_row(0, 4)
+    screen.roll_column(1, 1)
+    assert screen.to_array().tolist() == [[0, 1, 0, 0, 1, 0, 1],
+                                          [1, 0, 1, 0, 0, 0, 0],
+                                          [0, 1, 0, 0, 0, 0, 0]]
@@ -0,0 +1,13 @@
+import pytest
+
+from tools import importtime
+
+
+@pytest.fixture(scope='module')
+def budget():
+    return importtime.import_budget()
+
+
+@pytest.mark.parametrize('module', importtime.find_modules())
+def test_import_time(module, budget):
+    assert importtime.measure_import_time(module) <= budget
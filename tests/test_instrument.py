@@ -0,0 +1,25 @@
+import json
+
+from advent2017.code import dec05
+from common import instrument
+
+
+def test_disabled():
+    instrument.reset()
+    instrument.count('test.counter')
+    assert instrument.report()['counters'] == {}
+
+
+def test_counters_and_timings(tmpdir):
+    report_path = tmpdir.join('report.json')
+    instrument.enable(str(report_path))
+    instrument.reset()
+    try:
+        assert dec05.InstructionJumps().get_num_exit_moves([0, 3, 0, 1, -3]) == 5
+        instrument.write_report()
+    finally:
+        instrument.disable()
+
+    report = json.loads(report_path.read())
+    assert report['counters'] == {'dec05.jumps': 5}
+    assert report['timings']['dec05.InstructionJumps.get_num_exit_moves']['calls'] == 1
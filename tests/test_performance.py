@@ -0,0 +1,78 @@
+"""Performance regression tests, run with `pytest --benchmark`.
+
+Each solver is timed on a fixed size generated input, called enough times per run to rise well
+above timer noise. Timings are stored as multiples of a calibration workload, so baselines
+recorded on one machine remain meaningful on another.
+Use `pytest --benchmark-update` to record new baselines.
+"""
+import json
+import os
+
+import pytest
+
+from tools import benchmark
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+CASES = [case for case in benchmark.CASES if not case.slow]
+
+# timed runs below this many calibration units are mostly noise, so they are compared as if equal
+# to it
+NOISE_FLOOR = 0.25
+
+# each timed run calls the solver enough times to take at least this many calibration units, so
+# a case has to slow down by its threshold before it fails, however short a single call is
+MIN_RUN_TIME = 4 * NOISE_FLOOR
+
+
+@pytest.fixture(scope='module')
+def calibration():
+    return benchmark.calibrate()
+
+
+@pytest.fixture(scope='module')
+def baselines(request):
+    try:
+        with open(BASELINE_FILE) as fin:
+            stored = json.load(fin)
+    except FileNotFoundError:
+        stored = {}
+
+    yield stored
+
+    if request.config.getoption('--benchmark-update'):
+        with open(BASELINE_FILE, 'w') as fout:
+            json.dump(stored, fout, indent=2, sort_keys=True)
+            fout.write('\n')
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('case', CASES, ids=[case.name for case in CASES])
+def test_performance(case, calibration, baselines, request):
+    # the second size of each case is large enough to time reliably
+    size = case.sizes[1]
+    update = request.config.getoption('--benchmark-update')
+
+    if not update and (case.name not in baselines or baselines[case.name]['size'] != size
+                       or 'number' not in baselines[case.name]):
+        pytest.skip(f'no baseline for {case.name} at size {size}, use --benchmark-update')
+
+    if update:
+        # double the calls per run until a run is long enough, as timeit's autorange does
+        number = 1
+        while benchmark.time_case(case, size, number=number) * number / calibration < MIN_RUN_TIME:
+            number *= 2
+    else:
+        number = baselines[case.name]['number']
+    relative_time = benchmark.time_case(case, size, repeat=5, number=number) / calibration
+
+    if update:
+        baselines[case.name] = {'size': size, 'number': number, 'relative_time': relative_time}
+        return
+
+    # compare whole runs of number calls against the noise floor
+    threshold = request.config.getoption('--benchmark-threshold')
+    floor = NOISE_FLOOR / number
+    baseline = max(baselines[case.name]['relative_time'], floor)
+    assert max(relative_time, floor) <= baseline * threshold, \
+        f'{case.name} took {relative_time / baseline:.2f}x its baseline time (threshold {threshold}x)'
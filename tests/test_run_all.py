@@ -0,0 +1,22 @@
+import os
+
+from tools import run_all, solvers
+
+
+def test_part_recorder_folds_progress():
+    recorder = run_all.PartRecorder()
+    recorder.write('18f4----\n18f47---\n\nFIRST PASSWORD: 18f47a30\n')
+    recorder.write('\tFOUND A CANDIDATE ROOM: northpole\nSECTOR ID: 482\nSCREEN:\n#..#\n.##.')
+    recorder.close()
+    assert [part['output'] for part in recorder.parts] == [
+        'FIRST PASSWORD: 18f47a30', 'SECTOR ID: 482', 'SCREEN:', '.##.']
+
+
+def test_dead_worker(tmpdir):
+    # exits without running the solver's atexit handlers or sending a result
+    script = tmpdir.join('dec99.py')
+    script.write('import os\nprint("ANSWER: 1")\nos._exit(3)\n')
+    cwd = os.getcwd()
+    results = run_all.run_all([solvers.Solver(2016, 99, str(script))], jobs=1)
+    assert os.getcwd() == cwd
+    assert 'exited with code 3' in results['2016/dec99']['error']
@@ -0,0 +1,240 @@
+"""Benchmark each solver across a range of generated input sizes.
+
+For every case, the solver is timed on inputs from tools.generators at increasing sizes. The report
+gives the throughput at each size, and the growth exponent: the slope of log(time) against
+log(size), which is close to 1 for linear solvers and 2 for quadratic ones.
+
+Usage (from the repository root):
+
+    python -m tools.benchmark [--case 2016/dec03] [--sizes 1000 10000 100000] [--include-slow]
+"""
+import argparse
+import collections
+import contextlib
+import json
+import math
+import os
+import sys
+import time
+
+from tools import generators, solvers
+
+Case = collections.namedtuple('Case', ['name', 'year', 'day', 'call', 'sizes', 'slow'])
+
+LINE_SIZES = [10 ** 3, 10 ** 4, 10 ** 5]
+SMALL_SIZES = [10 ** 2, 10 ** 3, 10 ** 4]
+
+
+def _case(year, day, label, call, sizes=None, slow=False):
+    return Case(f'{year}/dec{day:02d} {label}', year, day, call, sizes or LINE_SIZES, slow)
+
+
+def _run_dec13(module, data):
+    favourite_number, max_moves = data
+    # the maze is cached between runs
+    module.maze.clear()
+    module.run(favourite_number, None, max_moves)
+
+
+CASES = [
+    _case(2016, 1, 'get_new_location', lambda m, d: m.get_new_location(d)),
+    _case(2016, 1, 'get_first_location_twice', lambda m, d: m.get_first_location_twice(d)),
+    _case(2016, 2, 'get_code', lambda m, d: m.get_code('5', d, m.KEYPAD_2), SMALL_SIZES),
+    _case(2016, 3, 'count_triangles', lambda m, d: m.count_triangles(d)),
+    _case(2016, 3, 'count_vertical_triangles', lambda m, d: m.count_vertical_triangles(d)),
+    _case(2016, 3, 'stream_count_vertical_triangles',
+          lambda m, d: m.stream_count_vertical_triangles(iter(d))),
+    _case(2016, 4, 'sum_real_sector_ids', lambda m, d: m.sum_real_sector_ids(d)),
+    _case(2016, 4, 'get_north_pole_sector_id', lambda m, d: m.get_north_pole_sector_id(d)),
+    _case(2016, 5, 'mine_chunk', lambda m, d: m.mine_chunk(d[0], 0, d[1], m.ZERO_NIBBLES),
+          [10 ** 4, 10 ** 5, 10 ** 6]),
+    _case(2016, 5, 'iter_chunks',
+          lambda m, d: collections.deque(m.iter_chunks(d[0], os.cpu_count(), 0, d[1]), maxlen=0),
+          [10 ** 5, 10 ** 6, 10 ** 7], slow=True),
+    _case(2016, 6, 'get_message', lambda m, d: m.get_message(d, 0)),
+    _case(2016, 7, 'count_tls_messages', lambda m, d: m.count_tls_messages(d)),
+    _case(2016, 7, 'count_ssl_messages', lambda m, d: m.count_ssl_messages(d)),
+    _case(2016, 8, 'get_screen', lambda m, d: m.get_screen(d, 50, 6), SMALL_SIZES),
+    _case(2016, 9, 'decompress', lambda m, d: m.decompress(d), [10 ** 4, 10 ** 5, 3 * 10 ** 5]),
+    _case(2016, 9, 'decompressed_length', lambda m, d: m.decompressed_length(d),
+          [10 ** 5, 10 ** 6, 10 ** 7]),
+    _case(2016, 9, 'decompressed_length (v2)', lambda m, d: m.decompressed_length(d, 2),
+          [10 ** 5, 10 ** 6, 10 ** 7]),
+    _case(2016, 9, 'iter_decompress (v2)',
+          lambda m, d: collections.deque(m.iter_decompress(d, 2), maxlen=0)),
+    _case(2016, 10, 'run', lambda m, d: m.run(d), SMALL_SIZES),
+    _case(2016, 12, 'get_registers', lambda m, d: m.get_registers(d)),
+    _case(2016, 13, 'run', _run_dec13, [10, 20, 40]),
+    _case(2016, 21, 'scramble', lambda m, d: m.scramble(d, 'abcdefgh')),
+    _case(2016, 21, 'unscramble', lambda m, d: m.unscramble(d[::-1], 'abcdefgh')),
+    _case(2017, 1, 'get_captcha_match_sum', lambda m, d: m.get_captcha_match_sum(d, 1)),
+    _case(2017, 1, 'get_captcha_match_sum (half)',
+          lambda m, d: m.get_captcha_match_sum(d, len(d) // 2)),
+    _case(2017, 2, 'get_max_min_checksum', lambda m, d: m.get_max_min_checksum(d)),
+    _case(2017, 2, 'get_divisible_checksum', lambda m, d: m.get_divisible_checksum(d)),
+    _case(2017, 3, 'get_spiral_distance', lambda m, d: m.get_spiral_distance(d),
+          [10 ** 4, 10 ** 6, 10 ** 8]),
+    _case(2017, 3, 'get_spiral_sum_value', lambda m, d: m.get_spiral_sum_value(d),
+          [10 ** 4, 10 ** 6, 10 ** 8]),
+    _case(2017, 4, 'get_num_unique_word_lines', lambda m, d: m.get_num_unique_word_lines(d)),
+    _case(2017, 4, 'get_num_unique_letter_lines', lambda m, d: m.get_num_unique_letter_lines(d)),
+    _case(2017, 5, 'InstructionJumps', lambda m, d: m.InstructionJumps().get_num_exit_moves(d),
+          SMALL_SIZES),
+    _case(2017, 5, 'InstructionJumpsModified',
+          lambda m, d: m.InstructionJumpsModified().get_num_exit_moves(d), SMALL_SIZES),
+]
+
+
+@contextlib.contextmanager
+def _no_cache():
+    # cached results would hide the cost of the solver
+    previous = os.environ.get(solvers.NO_CACHE_ENV)
+    os.environ[solvers.NO_CACHE_ENV] = '1'
+    try:
+        yield
+    finally:
+        if previous is None:
+            del os.environ[solvers.NO_CACHE_ENV]
+        else:
+            os.environ[solvers.NO_CACHE_ENV] = previous
+
+
+def time_case(case, size, repeat=1, seed=0, number=1):
+    """Time a single case at one input size. Input generation is not timed
+
+    :param Case case: case to time
+    :param int size: generated input size
+    :param int repeat: number of timed runs
+    :param int seed: generator seed
+    :param int number: calls to the solver in each timed run, so short calls can be timed
+        over long enough to rise above timer noise
+    :return: the fastest run time in seconds, divided by number
+    :rtype: float
+    """
+    module = solvers.load_module(case.year, case.day)
+    data = generators.GENERATORS[(case.year, case.day)](size, seed=seed)
+
+    best = math.inf
+    # some solvers print their progress
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull), _no_cache():
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                case.call(module, data)
+            best = min(best, time.perf_counter() - start)
+
+    return best / number
+
+
+def calibrate(repeat=5):
+    """Time a fixed pure Python workload, so timings from different machines can be compared
+    as multiples of it
+
+    :param int repeat: number of timed runs
+    :return: the fastest run time in seconds
+    :rtype: float
+    """
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        total = 0
+        for i in range(10 ** 6):
+            total += i * i
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def growth_exponent(sizes, times):
+    """Least squares slope of log(time) against log(size)
+
+    :param list(int) sizes: input sizes
+    :param list(float) times: run time at each size
+    :return: growth exponent, or None with fewer than two sizes
+    :rtype: float
+    """
+    points = [(math.log(s), math.log(t)) for s, t in zip(sizes, times) if t > 0]
+    if len(points) < 2:
+        return None
+
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+
+def run_case(case, sizes=None, repeat=1):
+    """Time a case at each input size
+
+    :param Case case: case to time
+    :param list(int) sizes: input sizes. Defaults to the case's own sizes
+    :param int repeat: number of timed runs per size
+    :return: sizes, times, throughputs and growth exponent, or the error raised by the solver
+    :rtype: dict
+    """
+    sizes = sizes or case.sizes
+    result = {'name': case.name, 'sizes': sizes, 'times': [], 'error': None}
+    try:
+        for size in sizes:
+            result['times'].append(time_case(case, size, repeat=repeat))
+    except Exception as e:
+        result['error'] = f'{type(e).__name__}: {e}'
+
+    result['throughputs'] = [s / t if t else math.inf for s, t in zip(sizes, result['times'])]
+    result['exponent'] = growth_exponent(sizes, result['times'])
+    return result
+
+
+def format_report(results):
+    """Format benchmark results as a table
+
+    :param list(dict) results: results from run_case
+    :return: report text
+    :rtype: str
+    """
+    header = f'{"CASE":<48} {"SIZE":>10} {"TIME (S)":>10} {"SIZE/S":>12}'
+    lines = [header, '-' * len(header)]
+    for result in results:
+        for size, t, throughput in zip(result['sizes'], result['times'], result['throughputs']):
+            lines.append(f'{result["name"]:<48} {size:>10} {t:>10.4f} {throughput:>12.4g}')
+
+        if result['error']:
+            lines.append(f'{result["name"]:<48} ERROR: {result["error"]}')
+        elif result['exponent'] is not None:
+            lines.append(f'{result["name"]:<48} GROWTH EXPONENT: {result["exponent"]:.2f}')
+
+    return '\n'.join(lines)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--case', action='append',
+                        help='only run cases whose name starts with this, e.g. 2016/dec03')
+    parser.add_argument('--sizes', type=int, nargs='+', help='override the input sizes')
+    parser.add_argument('--repeat', type=int, default=1, help='timed runs per size')
+    parser.add_argument('--include-slow', action='store_true', help='also run slow cases')
+    parser.add_argument('--json', help='also write the results to this file')
+    options = parser.parse_args(args)
+
+    cases = [case for case in CASES
+             if (options.include_slow or not case.slow)
+             and (not options.case or any(case.name.startswith(c) for c in options.case))]
+
+    header = format_report([])
+    print(header, flush=True)
+
+    results = []
+    for case in cases:
+        results.append(run_case(case, sizes=options.sizes, repeat=options.repeat))
+        # print each case as it finishes, without repeating the header
+        print(format_report(results[-1:])[len(header) + 1:], flush=True)
+
+    if options.json:
+        with open(options.json, 'w') as fout:
+            json.dump(results, fout, indent=2)
+
+    return 1 if any(result['error'] for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
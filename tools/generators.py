@@ -0,0 +1,363 @@
+"""Synthetic puzzle input generators, one per day.
+
+Every generator takes a size and a seed, and returns a valid puzzle input in the form the solver
+functions accept (usually a list of lines, as returned by utils.read_file). The meaning of size
+depends on the day, and is given in each docstring.
+"""
+import random
+import string
+
+LETTERS = string.ascii_lowercase
+
+# maps each byte value to a digit character
+DIGIT_TABLE = bytes(ord('0') + i % 10 for i in range(256))
+
+
+def _letters(rng, length, alphabet=LETTERS):
+    return ''.join(rng.choice(alphabet) for _ in range(length))
+
+
+def generate_2016_dec01(size, seed=0):
+    """Directions such as "R2, L3"
+
+    :param int size: number of moves
+    :param int seed: random seed
+    :return: comma separated moves
+    :rtype: str
+    """
+    rng = random.Random(seed)
+    return ', '.join(f'{rng.choice("LR")}{rng.randint(1, 200)}' for _ in range(size))
+
+
+def generate_2016_dec02(size, seed=0):
+    """Keypad instructions of U, D, L and R
+
+    :param int size: number of instruction lines, each of 100 moves
+    :param int seed: random seed
+    :return: instruction lines
+    :rtype: list(str)
+    """
+    rng = random.Random(seed)
+    return [_letters(rng, 100, 'UDLR') for _ in range(size)]
+
+
+def generate_2016_dec03(size, seed=0):
+    """Triangle side lengths, three per line
+
+    :param int size: number of lines. Rounded up to a multiple of 3
+    :param int seed: random seed
+    :return: lines of right aligned side lengths
+    :rtype: list(str)
+    """
+    rng = random.Random(seed)
+    num_lines = size + (-size % 3)
+    return [''.join(f'{rng.randint(1, 999):>5}' for _ in range(3)) for _ in range(num_lines)]
+
+
+def _room_checksum(encrypted_name):
+    letters = encrypted_name.replace('-', '')
+    ordered = sorted(set(letters), key=lambda letter: (-letters.count(letter), letter))
+    return ''.join(ordered[:5])
+
+
+def generate_2016_dec04(size, seed=0):
+    """Room names, half of which are real (checksum matches) and half decoys
+
+    :param int size: number of rooms
+    :param int seed: random seed
+    :return: lines such as aaaaa-bbb-z-y-x-123[abxyz]
+    :rtype: list(str)
+    """
+    rng = random.Random(seed)
+    rooms = []
+    for _ in range(size):
+        words = [_letters(rng, rng.randint(3, 10)) for _ in range(rng.randint(2, 5))]
+        encrypted_name = '-'.join(words) + '-'
+        if rng.random() < 0.5 and len(set(encrypted_name)) > 5:
+            checksum = _room_checksum(encrypted_name)
+        else:
+            checksum = ''.join(rng.sample(LETTERS, 5))
+        rooms.append(f'{encrypted_name}{rng.randint(100, 999)}[{checksum}]')
+    return rooms
+
+
+def generate_2016_dec05(size, seed=0):
+    """Door ID, and the number of indices to mine. The cost of mining depends on the number of
+    indices hashed, not on the door ID
+
+    :param int size: number of indices to mine
+    :param int seed: random seed
+    :return: door ID of 8 letters, number of indices
+    :rtype: tuple(str, int)
+    """
+    return _letters(random.Random(seed), 8), size
+
+
+def generate_2016_dec06(size, seed=0):
+    """Repetition code recording, 8 letters per line
+
+    :param int size: number of lines
+    :param int seed: random seed
+    :return: recorded lines
+    :rtype: list(str)
+    """
+    rng = random.Random(seed)
+    return [_letters(rng, 8) for _ in range(size)]
+
+
+def generate_2016_dec07(size, seed=0):
+    """IPv7 addresses, alternating supernet and [hypernet] sequences
+
+    :param int size: number of addresses
+    :param int seed: random seed
+    :return: addresses
+    :rtype: list(str)
+    """
+    rng = random.Random(seed)
+    addresses = []
+    for _ in range(size):
+        segments = [_letters(rng, rng.randint(4, 16)) for _ in range(rng.choice([3, 5, 7]))]
+        if rng.random() < 0.3:
+            # add an ABBA, so some addresses support TLS
+            i = rng.randrange(len(segments))
+            a, b = rng.sample(LETTERS, 2)
+            segments[i] += a + b + b + a
+        addresses.append(''.join(s if i % 2 == 0 else f'[{s}]' for i, s in enumerate(segments)))
+    return addresses
+
+
+def generate_2016_dec08(size, seed=0):
+    """Screen instructions for a 50x6 screen
+
+    :param int size: number of instructions
+    :param int seed: random seed
+    :return: rect and rotate instructions
+    :rtype: list(str)
+    """
+    rng = random.Random(seed)
+    instructions = []
+    for _ in range(size):
+        choice = rng.randrange(3)
+        if choice == 0:
+            instructions.append(f'rect {rng.randint(1, 10)}x{rng.randint(1, 6)}')
+        elif choice == 1:
+            instructions.append(f'rotate row y={rng.randrange(6)} by {rng.randint(1, 49)}')
+        else:
+            instructions.append(f'rotate column x={rng.randrange(50)} by {rng.randint(1, 5)}')
+    return instructions
+
+
+def _compressed_segment(rng, depth):
+    if depth > 0 and rng.random() < 0.3:
+        inner = ''.join(_compressed_segment(rng, depth - 1) for _ in range(rng.randint(1, 3)))
+        return f'({len(inner)}x{rng.randint(2, 9)}){inner}'
+    return _letters(rng, rng.randint(1, 10), string.ascii_uppercase)
+
+
+def generate_2016_dec09(size, seed=0):
+    """Compressed message, with markers nested up to 3 deep
+
+    Nested markers always lie entirely inside their enclosing marker's span, so the message is
+    valid for both format versions.
+
+    :param int size: minimum length of the compressed message
+    :param int seed: random seed
+    :return: compressed message
+    :rtype: str
+    """
+    rng = random.Random(seed)
+    segments, length = [], 0
+    while length < size:
+        segments.append(_compressed_segment(rng, 3))
+        length += len(segments[-1])
+    return ''.join(segments)
+
+
+def generate_2016_dec10(size, seed=0):
+    """Bot instructions, for a binary tree of bots that pass their high chip up to the root
+
+    Each bot receives a chip from each of its (up to two) child bots, plus an input value for each
+    missing child, so every bot ends up with exactly two chips. Bot N gives its low chip to output N.
+
+    :param int size: number of bots. At least 3, so outputs 0, 1 and 2 receive a chip
+    :param int seed: random seed
+    :return: value and bot instructions, in random order
+    :rtype: list(str)
+    """
+    rng = random.Random(seed)
+    num_bots = max(size, 3)
+    values = iter(rng.sample(range(1, 10 * num_bots), num_bots + 1))
+
+    instructions = []
+    for bot in range(num_bots):
+        num_children = len([child for child in (2 * bot + 1, 2 * bot + 2) if child < num_bots])
+        for _ in range(2 - num_children):
+            instructions.append(f'value {next(values)} goes to bot {bot}')
+
+        high = f'bot {(bot - 1) // 2}' if bot > 0 else f'output {num_bots}'
+        instructions.append(f'bot {bot} gives low to output {bot} and high to {high}')
+
+    rng.shuffle(instructions)
+    return instructions
+
+
+def generate_2016_dec12(size, seed=0):
+    """Assembunny program, which loops size times
+
+    :param int size: number of loop iterations. Each iteration executes 3 instructions
+    :param int seed: unused. The program is deterministic
+    :return: program instructions
+    :rtype: list(str)
+    """
+    return ['cpy 1 a', f'cpy {size} c', 'inc a', 'dec c', 'jnz c -2', 'cpy a b']
+
+
+def _is_open_space(x, y, favourite_number):
+    value = x * x + 3 * x + 2 * x * y + y + y * y + favourite_number
+    return x >= 0 and y >= 0 and bin(value).count('1') % 2 == 0
+
+
+def _has_open_frontier(favourite_number, num_moves):
+    visited = frontier = {(1, 1)}
+    for _ in range(num_moves):
+        frontier = {(x + i, y + j) for x, y in frontier for i, j in ((-1, 0), (0, -1), (1, 0), (0, 1))
+                    if _is_open_space(x + i, y + j, favourite_number)} - visited
+        if not frontier:
+            return False
+        visited = visited | frontier
+    return True
+
+
+def generate_2016_dec13(size, seed=0):
+    """Office designer's favourite number, and the number of moves to explore
+
+    Favourite numbers that wall in the start position within size moves are skipped.
+
+    :param int size: number of moves to explore
+    :param int seed: random seed
+    :return: favourite number, number of moves
+    :rtype: tuple(int, int)
+    """
+    rng = random.Random(seed)
+    while True:
+        favourite_number = rng.randint(1, 2000)
+        if _has_open_frontier(favourite_number, size):
+            return favourite_number, size
+
+
+def generate_2016_dec21(size, seed=0):
+    """Scrambling instructions for an 8 letter password
+
+    :param int size: number of instructions
+    :param int seed: random seed
+    :return: scrambling instructions
+    :rtype: list(str)
+    """
+    rng = random.Random(seed)
+    length = 8
+    letters = LETTERS[:length]
+    instructions = []
+    for _ in range(size):
+        choice = rng.randrange(6)
+        x, y = rng.sample(range(length), 2)
+        if choice == 0:
+            instructions.append(f'swap position {x} with position {y}')
+        elif choice == 1:
+            instructions.append(f'swap letter {letters[x]} with letter {letters[y]}')
+        elif choice == 2:
+            instructions.append(f'rotate {rng.choice(["left", "right"])} {x} steps')
+        elif choice == 3:
+            instructions.append(f'rotate based on position of letter {letters[x]}')
+        elif choice == 4:
+            instructions.append(f'reverse positions {min(x, y)} through {max(x, y)}')
+        else:
+            instructions.append(f'move position {x} to position {y}')
+    return instructions
+
+
+def generate_2017_dec01(size, seed=0):
+    """Captcha of digits
+
+    :param int size: number of digits. Rounded up to an even number
+    :param int seed: random seed
+    :return: captcha
+    :rtype: str
+    """
+    rng = random.Random(seed)
+    num_digits = size + size % 2
+    if not num_digits:
+        return ''
+    # a digit per random byte, made in bulk rather than with a choice per digit. 0 to 5 are
+    # slightly more common, which doesn't matter for timing
+    random_bytes = rng.getrandbits(8 * num_digits).to_bytes(num_digits, 'little')
+    return random_bytes.translate(DIGIT_TABLE).decode()
+
+
+def generate_2017_dec02(size, seed=0):
+    """Spreadsheet of 16 integers per row
+
+    :param int size: number of rows
+    :param int seed: random seed
+    :return: rows of integers
+    :rtype: list(list(int))
+    """
+    rng = random.Random(seed)
+    return [[rng.randint(1, 9999) for _ in range(16)] for _ in range(size)]
+
+
+def generate_2017_dec03(size, seed=0):
+    """Spiral memory square
+
+    :param int size: the square number
+    :param int seed: unused
+    :return: square number
+    :rtype: int
+    """
+    return max(size, 1)
+
+
+def generate_2017_dec04(size, seed=0):
+    """Passphrases of 4 to 12 words
+
+    :param int size: number of passphrases
+    :param int seed: random seed
+    :return: passphrases, as lists of words
+    :rtype: list(list(str))
+    """
+    rng = random.Random(seed)
+    return [[_letters(rng, rng.randint(2, 7), 'abcdefgh') for _ in range(rng.randint(4, 12))]
+            for _ in range(size)]
+
+
+def generate_2017_dec05(size, seed=0):
+    """Jump offsets
+
+    :param int size: number of offsets
+    :param int seed: random seed
+    :return: jump offsets
+    :rtype: list(int)
+    """
+    rng = random.Random(seed)
+    return [rng.randint(-5, 1) for _ in range(size)]
+
+
+GENERATORS = {
+    (2016, 1): generate_2016_dec01,
+    (2016, 2): generate_2016_dec02,
+    (2016, 3): generate_2016_dec03,
+    (2016, 4): generate_2016_dec04,
+    (2016, 5): generate_2016_dec05,
+    (2016, 6): generate_2016_dec06,
+    (2016, 7): generate_2016_dec07,
+    (2016, 8): generate_2016_dec08,
+    (2016, 9): generate_2016_dec09,
+    (2016, 10): generate_2016_dec10,
+    (2016, 12): generate_2016_dec12,
+    (2016, 13): generate_2016_dec13,
+    (2016, 21): generate_2016_dec21,
+    (2017, 1): generate_2017_dec01,
+    (2017, 2): generate_2017_dec02,
+    (2017, 3): generate_2017_dec03,
+    (2017, 4): generate_2017_dec04,
+    (2017, 5): generate_2017_dec05,
+}
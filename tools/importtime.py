@@ -0,0 +1,130 @@
+"""Measure the import time of every module in both years.
+
+Each module is imported in a fresh interpreter, and timed there with time.perf_counter, so its
+time includes everything it imports. Solvers are often run many times in short-lived processes,
+so every module must import within IMPORT_BUDGET_STARTUPS times the start up time of a bare
+interpreter. The budget scales with the speed of the machine, and is enforced by
+tests/test_importtime.py.
+
+Usage (from the repository root):
+
+    python -m tools.importtime
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from tools import solvers
+
+# multiples of the start up time of a bare interpreter. Importing numpy alone takes several
+# times longer than this
+IMPORT_BUDGET_STARTUPS = 4
+
+# run in the fresh interpreter, to print the import time of a module in microseconds
+TIMER_CODE = """
+import importlib, time
+start = time.perf_counter()
+importlib.import_module({module!r})
+print(round((time.perf_counter() - start) * 10 ** 6))
+"""
+
+
+def find_modules():
+    """Find the dotted name of every module in both years, and of the helpers they share
+
+    :return: module names, e.g. advent2016.dec01
+    :rtype: list(str)
+    """
+    modules = []
+    package_dirs = [year_dir for _, year_dir in sorted(solvers.YEAR_DIRS.items())]
+    for package_dir in package_dirs + [solvers.COMMON_PACKAGE]:
+        package = package_dir.replace(os.sep, '.')
+        for filename in sorted(os.listdir(os.path.join(solvers.ROOT_DIR, package_dir))):
+            name, ext = os.path.splitext(filename)
+            if ext == '.py' and name != '__init__':
+                modules.append(f'{package}.{name}')
+    return modules
+
+
+def measure_startup_time(repeat=3):
+    """Start a bare interpreter that does nothing, to scale the import budget to this machine
+
+    :param int repeat: number of starts. The fastest is kept
+    :return: start up time in microseconds
+    :rtype: int
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'], check=True)
+        times.append(round((time.perf_counter() - start) * 10 ** 6))
+    return min(times)
+
+
+def import_budget(startup_us=None):
+    """Import time budget for every module
+
+    :param int startup_us: start up time of a bare interpreter. Measured if None
+    :return: budget in microseconds
+    :rtype: int
+    """
+    startup_us = measure_startup_time() if startup_us is None else startup_us
+    return IMPORT_BUDGET_STARTUPS * startup_us
+
+
+def measure_import_time(module, repeat=3):
+    """Import a module in a fresh interpreter
+
+    :param str module: dotted module name
+    :param int repeat: number of imports. The fastest is kept, to ignore one-off costs
+        such as compiling the module
+    :return: import time in microseconds, including everything the module imports
+    :rtype: int
+    """
+    env = dict(os.environ)
+    # 2016 solvers `import utils` from their own directory
+    env['PYTHONPATH'] = os.pathsep.join([solvers.ROOT_DIR, os.path.join(solvers.ROOT_DIR, 'advent2016')])
+
+    times = []
+    for _ in range(repeat):
+        process = subprocess.run([sys.executable, '-c', TIMER_CODE.format(module=module)],
+                                 env=env, cwd=solvers.ROOT_DIR, stdout=subprocess.PIPE,
+                                 stderr=subprocess.PIPE, universal_newlines=True)
+        if process.returncode:
+            raise ImportError(f'Failed to import {module}:\n{process.stderr}')
+        # the module may print while it's imported, so the time is the last line
+        output = process.stdout.strip().splitlines()
+        if not output or not output[-1].isdigit():
+            raise RuntimeError(f'No import time printed for {module}:\n{process.stdout}')
+        times.append(int(output[-1]))
+
+    return min(times)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--budget', type=int,
+                        help='import time budget in microseconds. Defaults to '
+                             f'{IMPORT_BUDGET_STARTUPS} times the start up time of a bare interpreter')
+    options = parser.parse_args(args)
+    budget = options.budget or import_budget()
+
+    results = {module: measure_import_time(module) for module in find_modules()}
+
+    print(f'{"MODULE":<28} {"IMPORT (US)":>16}')
+    over_budget = []
+    for module, import_us in sorted(results.items(), key=lambda item: -item[1]):
+        flag = ''
+        if import_us > budget:
+            flag = '  OVER BUDGET'
+            over_budget.append(module)
+        print(f'{module:<28} {import_us:>16}{flag}')
+
+    print(f'\nBUDGET: {budget} us. {len(over_budget)} module(s) over budget')
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""Profile the memory allocated by each solver, using tracemalloc.
+
+Each solver runs in its own process, as `python decNN.py` would from the solver's directory.
+A background thread samples the traced memory, and keeps a snapshot of the allocations whenever
+they reach a new high, so the top allocation sites reported are those at (or close to) the peak.
+
+Usage (from the repository root):
+
+    python -m tools.memprofile [--solver 2016/dec08] [--year 2016] [--top 10] [--json results.json]
+"""
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import runpy
+import sys
+import threading
+import traceback
+import tracemalloc
+
+from tools import solvers
+
+SAMPLE_INTERVAL = 0.05
+
+# module import machinery, and the profiler itself, are left out of the allocation sites
+SITE_FILTERS = [
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+]
+
+
+class PeakSampler(threading.Thread):
+    """Keep a snapshot of the traced allocations whenever they reach a new high"""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.snapshot = None
+        self.snapshot_size = -1
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        current, _ = tracemalloc.get_traced_memory()
+        if current > self.snapshot_size:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.snapshot_size = current
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.sample()
+
+
+def count_lines(path):
+    """Count the lines in a puzzle input
+
+    :param str path: full path to the input file
+    :return: number of non-blank lines
+    :rtype: int
+    """
+    with open(path, 'rb') as fin:
+        return sum(1 for line in fin if line.strip())
+
+
+def profile_solver(solver, top=10):
+    """Run a single solver script as __main__ under tracemalloc
+
+    :param Solver solver: solver to profile
+    :param int top: number of allocation sites to report
+    :return: peak allocation, top allocation sites near the peak, and allocations per input line
+    :rtype: dict
+    """
+    solvers.prepare_main(solver)
+    # a cached result would hide the memory the solver needs. Each solver has a fresh process
+    os.environ[solvers.NO_CACHE_ENV] = '1'
+    error = None
+
+    tracemalloc.start()
+    sampler = PeakSampler()
+    sampler.start()
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            runpy.run_path(solver.path, run_name='__main__')
+    except BaseException:
+        error = traceback.format_exc()
+    finally:
+        sampler.stop()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    snapshot = sampler.snapshot.filter_traces(SITE_FILTERS) if sampler.snapshot else None
+    statistics = snapshot.statistics('lineno') if snapshot else []
+    sites = [{'site': f'{stat.traceback[0].filename}:{stat.traceback[0].lineno}',
+              'size': stat.size, 'count': stat.count} for stat in statistics[:top]]
+
+    input_path = solvers.input_path(solver)
+    num_lines = count_lines(input_path) if input_path else None
+    num_blocks = sum(stat.count for stat in statistics)
+
+    return {
+        'name': solvers.solver_name(solver),
+        'peak': peak,
+        'num_lines': num_lines,
+        'peak_per_line': peak / num_lines if num_lines else None,
+        'blocks_per_line': num_blocks / num_lines if num_lines else None,
+        'top_sites': sites,
+        'error': error,
+    }
+
+
+def profile_all(solver_list, jobs=None, top=10):
+    """Profile solvers in a process pool, one fresh process per solver
+
+    :param list(Solver) solver_list: solvers to profile
+    :param int jobs: number of worker processes. Defaults to the number of cores
+    :param int top: number of allocation sites to report per solver
+    :return: results keyed by solver name
+    :rtype: dict(str: dict)
+    """
+    results = {}
+    with multiprocessing.Pool(processes=jobs or os.cpu_count(), maxtasksperchild=1) as pool:
+        tasks = [(solver, top) for solver in solver_list]
+        for result in pool.starmap(profile_solver, tasks):
+            results[result['name']] = result
+    return results
+
+
+def format_report(results):
+    """Format the results, with the top allocation sites of each solver
+
+    :param dict(str: dict) results: results keyed by solver name
+    :return: report text
+    :rtype: str
+    """
+    lines = []
+    for name, result in sorted(results.items()):
+        per_line = ''
+        if result['num_lines']:
+            per_line = (f', {result["num_lines"]} input lines, {result["peak_per_line"]:.1f} B '
+                        f'and {result["blocks_per_line"]:.2f} blocks per line')
+        status = ' FAILED' if result['error'] else ''
+        lines.append(f'{name}: peak {result["peak"] / 1024:.1f} KiB{per_line}{status}')
+        for site in result['top_sites']:
+            lines.append(f'    {site["size"] / 1024:>10.1f} KiB {site["count"]:>8} blocks  {site["site"]}')
+    return '\n'.join(lines)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--solver', action='append', help='only profile this solver, e.g. 2016/dec08')
+    parser.add_argument('--year', type=int, action='append', help='only profile solvers for this year')
+    parser.add_argument('--top', type=int, default=10, help='number of allocation sites to show')
+    parser.add_argument('--jobs', type=int, default=None, help='number of worker processes')
+    parser.add_argument('--json', help='also write the full results to this file')
+    options = parser.parse_args(args)
+
+    solver_list = [solver for solver in solvers.find_solvers(options.year)
+                   if not options.solver or solvers.solver_name(solver) in options.solver]
+    results = profile_all(solver_list, jobs=options.jobs, top=options.top)
+    print(format_report(results))
+
+    if options.json:
+        with open(options.json, 'w') as fout:
+            json.dump(results, fout, indent=2)
+
+    return 1 if any(result['error'] for result in results.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""Run every daily solver in parallel and report the cost of each part.
+
+Each solver runs in its own worker process, exactly as `python decNN.py` would from the solver's
+directory. Every labelled answer line the solver prints (e.g. `TRIANGLE COUNT: 982`) is treated as
+the end of a part, and is stamped with the wall time and CPU time spent since the previous part,
+and the peak RSS of the process so far. Other lines, such as progress output, are folded into the
+part they precede.
+
+Usage (from the repository root):
+
+    python -m tools.run_all [--jobs N] [--year 2016] [--json results.json] [--instrument DIR]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import queue as queue_module
+import re
+import resource
+import runpy
+import sys
+import time
+import traceback
+
+from tools import solvers
+
+# the slowest solvers are scheduled first, so they don't finish long after everything else
+SLOW_SOLVERS = ['2016/dec05', '2016/dec12']
+
+# see common.instrument
+INSTRUMENT_ENV = 'ADVENT_INSTRUMENT'
+
+# an answer starts unindented, with a label ending in a colon
+ANSWER_PATTERN = re.compile(r'^[^\s:][^:]*:')
+
+# seconds to wait for a result before checking whether any worker process has died
+POLL_INTERVAL = 1.0
+
+
+class PartRecorder:
+    """Stand-in for sys.stdout, which stamps the cost of each printed answer"""
+
+    def __init__(self):
+        self.parts = []
+        self._buffer = ''
+        # last line printed since the previous part, if it wasn't an answer
+        self._pending = None
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+
+    def write(self, text):
+        self._buffer += text
+        while '\n' in self._buffer:
+            line, self._buffer = self._buffer.split('\n', 1)
+            self._add_line(line)
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self._add_line(self._buffer)
+        self._buffer = ''
+        # output after the last answer, or from a solver that prints no labelled answers
+        if self._pending is not None:
+            self._record(self._pending)
+
+    def _add_line(self, line):
+        if not line.strip():
+            return
+        if ANSWER_PATTERN.match(line):
+            self._record(line)
+        else:
+            self._pending = line
+
+    def _record(self, line):
+        wall, cpu = time.perf_counter(), time.process_time()
+        self.parts.append({
+            'output': line.strip(),
+            'wall_time': wall - self._wall,
+            'cpu_time': cpu - self._cpu,
+            'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        })
+        self._wall, self._cpu = wall, cpu
+        self._pending = None
+
+
+def run_solver(solver, instrument_dir=None):
+    """Run a single solver script as __main__, from its own directory
+
+    :param Solver solver: solver to run
+    :param str instrument_dir: write the solver's instrumentation report to this directory
+    :return: the recorded parts, totals, and any error raised by the solver
+    :rtype: dict
+    """
+    solvers.prepare_main(solver)
+
+    if instrument_dir:
+        report_name = solvers.solver_name(solver).replace('/', '_') + '.json'
+        os.environ[INSTRUMENT_ENV] = os.path.join(instrument_dir, report_name)
+
+    recorder = PartRecorder()
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    error = None
+
+    stdout = sys.stdout
+    sys.stdout = recorder
+    try:
+        runpy.run_path(solver.path, run_name='__main__')
+    except BaseException:
+        error = traceback.format_exc()
+    finally:
+        sys.stdout = stdout
+        recorder.close()
+
+    instrument_module = f'{solvers.COMMON_PACKAGE}.instrument'
+    if instrument_dir and instrument_module in sys.modules:
+        # worker processes exit without running atexit handlers
+        sys.modules[instrument_module].write_report()
+
+    return {
+        'name': solvers.solver_name(solver),
+        'path': solver.path,
+        'parts': recorder.parts,
+        'wall_time': time.perf_counter() - start_wall,
+        'cpu_time': time.process_time() - start_cpu,
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'error': error,
+    }
+
+
+def schedule(solver_list):
+    """Order solvers so that the known slow ones start first
+
+    :param list(Solver) solver_list: solvers to run
+    :return: solvers in the order they should be submitted
+    :rtype: list(Solver)
+    """
+    def priority(solver):
+        name = solvers.solver_name(solver)
+        return SLOW_SOLVERS.index(name) if name in SLOW_SOLVERS else len(SLOW_SOLVERS)
+
+    return sorted(solver_list, key=priority)
+
+
+def _run_solver_process(solver, instrument_dir, queue):
+    queue.put(run_solver(solver, instrument_dir))
+
+
+def _failed_result(solver, process, start_wall):
+    """Result for a worker process that died without sending one, e.g. killed or out of memory"""
+    return {
+        'name': solvers.solver_name(solver),
+        'path': solver.path,
+        'parts': [],
+        'wall_time': time.perf_counter() - start_wall,
+        'cpu_time': 0.0,
+        'peak_rss_kb': 0,
+        'error': f'worker process exited with code {process.exitcode} before sending a result',
+    }
+
+
+def run_all(solver_list, jobs=None, instrument_dir=None):
+    """Run solvers in parallel, one fresh process per solver
+
+    :param list(Solver) solver_list: solvers to run
+    :param int jobs: maximum number of solver processes at once. Defaults to the number of cores
+    :param str instrument_dir: write an instrumentation report per solver to this directory
+    :return: results keyed by solver name
+    :rtype: dict(str: dict)
+    """
+    jobs = jobs or os.cpu_count()
+    if instrument_dir:
+        instrument_dir = os.path.abspath(instrument_dir)
+        os.makedirs(instrument_dir, exist_ok=True)
+
+    # a new process per solver keeps each peak RSS and set of imported modules separate. These
+    # aren't pool workers, which are daemonic, so a solver can still start its own pool
+    queue = multiprocessing.Queue()
+    pending = schedule(solver_list)
+    # solver name: (solver, process, wall time it started at)
+    running = {}
+    results = {}
+    while pending or running:
+        while pending and len(running) < jobs:
+            solver = pending.pop(0)
+            process = multiprocessing.Process(target=_run_solver_process,
+                                              args=(solver, instrument_dir, queue))
+            process.start()
+            running[solvers.solver_name(solver)] = (solver, process, time.perf_counter())
+
+        # a worker puts its result before it exits, so one that was already dead has had the
+        # whole poll interval to deliver it
+        dead = [name for name, (_, process, _) in running.items() if not process.is_alive()]
+        try:
+            result = queue.get(timeout=POLL_INTERVAL)
+        except queue_module.Empty:
+            for name in dead:
+                solver, process, start_wall = running.pop(name)
+                process.join()
+                results[name] = _failed_result(solver, process, start_wall)
+        else:
+            results[result['name']] = result
+            running.pop(result['name'])[1].join()
+
+    return results
+
+
+def format_report(results):
+    """Format results as a table, with one row per part and a total per solver
+
+    :param dict(str: dict) results: results keyed by solver name
+    :return: report text
+    :rtype: str
+    """
+    header = f'{"SOLVER":<12} {"PART":>4} {"WALL (S)":>9} {"CPU (S)":>9} {"PEAK RSS (MB)":>14}  OUTPUT'
+    lines = [header, '-' * len(header)]
+    for name in sorted(results):
+        result = results[name]
+        for i, part in enumerate(result['parts'], 1):
+            lines.append(f'{name:<12} {i:>4} {part["wall_time"]:>9.3f} {part["cpu_time"]:>9.3f} '
+                         f'{part["peak_rss_kb"] / 1024:>14.1f}  {part["output"][:60]}')
+
+        status = 'FAILED' if result['error'] else ''
+        lines.append(f'{name:<12} {"ALL":>4} {result["wall_time"]:>9.3f} {result["cpu_time"]:>9.3f} '
+                     f'{result["peak_rss_kb"] / 1024:>14.1f}  {status}')
+
+    return '\n'.join(lines)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--jobs', type=int, default=None, help='number of worker processes')
+    parser.add_argument('--year', type=int, action='append', help='only run solvers for this year')
+    parser.add_argument('--json', help='also write the full results to this file')
+    parser.add_argument('--no-cache', action='store_true', help='bypass cached solver results')
+    parser.add_argument('--instrument', metavar='DIR',
+                        help='write a JSON instrumentation report per solver to this directory. '
+                             'Implies --no-cache')
+    options = parser.parse_args(args)
+
+    # a cached result skips the instrumented code, and would report no counters
+    if options.no_cache or options.instrument:
+        # inherited by the worker processes
+        os.environ[solvers.NO_CACHE_ENV] = '1'
+
+    start = time.perf_counter()
+    results = run_all(solvers.find_solvers(options.year), jobs=options.jobs,
+                      instrument_dir=options.instrument)
+
+    print(format_report(results))
+    print(f'\nTOTAL WALL TIME: {time.perf_counter() - start:.3f} s')
+
+    for name, result in sorted(results.items()):
+        if result['error']:
+            print(f'\n{name} FAILED:\n{result["error"]}', file=sys.stderr)
+
+    if options.json:
+        with open(options.json, 'w') as fout:
+            json.dump(results, fout, indent=2)
+
+    return 1 if any(result['error'] for result in results.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""Locate the daily solver modules for each year.
+
+Each solver is a stand-alone script (decNN.py) that expects to be run from its own directory,
+so it can find its input file and `import utils`.
+"""
+from collections import namedtuple
+import importlib
+import os
+import re
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# year: directory holding the solver scripts, relative to the repository root
+YEAR_DIRS = {
+    2016: 'advent2016',
+    2017: os.path.join('advent2017', 'code'),
+}
+
+# year: directory holding the puzzle inputs, relative to the repository root
+INPUT_DIRS = {
+    2016: 'advent2016',
+    2017: os.path.join('advent2017', 'inputs'),
+}
+
+# package at the repository root, of the helpers that every year shares
+COMMON_PACKAGE = 'common'
+
+# modules that each year has its own version of
+HELPER_MODULES = ['utils']
+
+# bypasses cached solver results when set. See utils.cached in advent2016
+NO_CACHE_ENV = 'ADVENT_NO_CACHE'
+
+SOLVER_PATTERN = re.compile(r'^dec(?P<day>\d{2})\.py$')
+
+Solver = namedtuple('Solver', ['year', 'day', 'path'])
+
+
+def solver_name(solver):
+    """Short name used in reports, e.g. 2016/dec05
+
+    :param Solver solver: solver to name
+    :return: year and module name
+    :rtype: str
+    """
+    return f'{solver.year}/dec{solver.day:02d}'
+
+
+def find_solvers(years=None):
+    """Find every decNN solver module
+
+    :param list(int) years: only return solvers for these years. All years if None
+    :return: solvers, ordered by year and day
+    :rtype: list(Solver)
+    """
+    solvers = []
+    for year, year_dir in sorted(YEAR_DIRS.items()):
+        if years and year not in years:
+            continue
+
+        full_dir = os.path.join(ROOT_DIR, year_dir)
+        for filename in sorted(os.listdir(full_dir)):
+            match = SOLVER_PATTERN.match(filename)
+            if match:
+                solvers.append(Solver(year, int(match.group('day')), os.path.join(full_dir, filename)))
+
+    return solvers
+
+
+def load_module(year, day):
+    """Import a solver module, without running its __main__ block
+
+    :param int year: solver year
+    :param int day: solver day
+    :return: the imported solver module
+    :rtype: module
+    """
+    paths = [ROOT_DIR]
+    if year == 2016:
+        # 2016 solvers `import utils` at the top of the module, from their own directory
+        paths.append(os.path.join(ROOT_DIR, YEAR_DIRS[year]))
+
+    for path in paths:
+        if path not in sys.path:
+            sys.path.append(path)
+
+    package = YEAR_DIRS[year].replace(os.sep, '.')
+    return importlib.import_module(f'{package}.dec{day:02d}')
+
+
+def input_path(solver):
+    """Path to a solver's puzzle input
+
+    :param Solver solver: solver
+    :return: full path to the input file, or None if the puzzle input is not a file
+    :rtype: str
+    """
+    path = os.path.join(ROOT_DIR, INPUT_DIRS[solver.year], f'dec{solver.day:02d}_input.txt')
+    return path if os.path.exists(path) else None
+
+
+def prepare_main(solver):
+    """Set up the current process to run a solver script as __main__, as if it had been run
+    with `python decNN.py` from its own directory
+
+    :param Solver solver: solver to run
+    """
+    solver_dir = os.path.dirname(solver.path)
+    os.chdir(solver_dir)
+    sys.path.insert(0, solver_dir)
+    for module in HELPER_MODULES:
+        sys.modules.pop(module, None)
+
+    # common.instrument reads its environment variable when it's imported, so import it afresh
+    for module in list(sys.modules):
+        if module == COMMON_PACKAGE or module.startswith(COMMON_PACKAGE + '.'):
+            del sys.modules[module]